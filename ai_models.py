@@ -8,7 +8,7 @@ import sys
 import torch
 import logging
 import numpy as np
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Tuple, Union
 import base64
 import io
 from PIL import Image
@@ -45,11 +45,20 @@ class StableAudioWrapper:
         """Load the Stable Audio model"""
         return self.real_generator.load_model()
     
+    @property
+    def sample_rate(self) -> int:
+        """Sample rate of generated audio"""
+        return self.real_generator.config["sample_rate"]
+    
+    def generate_audio_array(self, prompt: str, duration: float = 10.0, **kwargs) -> Optional[np.ndarray]:
+        """Generate float32 audio shaped (channels, samples) using real generator"""
+        return self.real_generator.generate_audio_array(prompt, duration, **kwargs)
+    
     def generate_audio(self, prompt: str, duration: float = 10.0, 
                       steps: int = 100, cfg_scale: float = 7.0,
-                      seed: Optional[int] = None) -> bytes:
+                      seed: Optional[int] = None, output_format: str = "wav") -> Optional[Union[bytearray, bytes]]:
         """Generate audio using real generator"""
-        return self.real_generator.generate_audio(prompt, duration, steps, cfg_scale, seed)
+        return self.real_generator.generate_audio(prompt, duration, steps, cfg_scale, seed, output_format)
 
 class WAN21VideoGenerator:
     """
@@ -110,6 +119,10 @@ class WAN21VideoGenerator:
         """Generate video using real generator"""
         return self.real_generator.generate_video(prompt, aspect_ratio, **kwargs)
     
+    def generate_frames(self, prompt: str, aspect_ratio: str = "16:9", **kwargs) -> Optional[Tuple[np.ndarray, Dict[str, Any]]]:
+        """Generate a clip as a uint8 frame array plus render info using real generator"""
+        return self.real_generator.generate_frames(prompt, aspect_ratio, **kwargs)
+    
     def get_deployment_instructions(self) -> str:
         """Get deployment instructions"""
         return self.real_generator.get_deployment_guide()
@@ -169,20 +182,21 @@ class WAN21VideoGenerator:
             return False
     
     def generate_video(self, prompt: str, aspect_ratio: str = "16:9", 
-                      num_frames: int = 81, fps: int = 24, 
+                      num_frames: Optional[int] = None, fps: int = 24, 
                       guidance_scale: float = 6.0, num_inference_steps: int = 50,
-                      seed: Optional[int] = None) -> bytes:
+                      seed: Optional[int] = None, duration: Optional[float] = None) -> bytes:
         """
         Generate video from text prompt
         
         Args:
             prompt: Text prompt for video generation
             aspect_ratio: Aspect ratio ("16:9" or "9:16")
-            num_frames: Number of frames to generate (default: 81)
+            num_frames: Number of frames to generate (default: derived from duration)
             fps: Frames per second (default: 24)
             guidance_scale: Guidance scale for generation
             num_inference_steps: Number of inference steps
             seed: Random seed for reproducibility
+            duration: Clip duration in seconds (used when num_frames is not given)
             
         Returns:
             bytes: Video data in MP4 format
@@ -194,7 +208,8 @@ class WAN21VideoGenerator:
             fps=fps,
             guidance_scale=guidance_scale,
             num_inference_steps=num_inference_steps,
-            seed=seed
+            seed=seed,
+            duration=duration
         )
     
 
@@ -252,9 +267,17 @@ class AIModelManager:
         """Generate video using WAN 2.1 model"""
         return self.wan21_generator.generate_video(prompt, aspect_ratio, **kwargs)
     
-    def generate_audio(self, prompt: str, duration: int = 10) -> Optional[bytes]:
+    def generate_frames(self, prompt: str, aspect_ratio: str = "16:9", **kwargs) -> Optional[Tuple[np.ndarray, Dict[str, Any]]]:
+        """Generate a clip as a frame array using WAN 2.1 model"""
+        return self.wan21_generator.generate_frames(prompt, aspect_ratio, **kwargs)
+    
+    def generate_audio(self, prompt: str, duration: int = 10, **kwargs) -> Optional[Union[bytearray, bytes]]:
         """Generate audio using Stable Audio model"""
-        return self.stable_audio.generate_audio(prompt, duration)
+        return self.stable_audio.generate_audio(prompt, duration, **kwargs)
+    
+    def generate_audio_array(self, prompt: str, duration: float = 10, **kwargs) -> Optional[np.ndarray]:
+        """Generate raw float32 audio using Stable Audio model"""
+        return self.stable_audio.generate_audio_array(prompt, duration, **kwargs)
     
     def get_model_status(self) -> Dict[str, Any]:
         """Get status of all models"""
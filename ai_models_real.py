@@ -8,17 +8,24 @@ import sys
 import torch
 import logging
 import numpy as np
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Tuple, Union
 import base64
 import io
 from PIL import Image
-import tempfile
-import cv2
 import json
 from datetime import datetime
 import subprocess
 import asyncio
+import time
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from synthetic_media import SyntheticVideoEngine, SyntheticAudioEngine, prompt_seed
+from audio_processing import encode_audio, plan_windows, stitch_crossfade
+from video_processing import (
+    plan_temporal_chunks, blend_chunks, to_uint8_frames, encode_frames,
+    rendered_frame_count, interpolate_frames, scaled_resolution, upscale_frames
+)
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -78,6 +85,8 @@ class RealWAN21VideoGenerator:
             "sample_fps": 24,
             "num_train_timesteps": 1000,
             "max_frames": 81,
+            "chunk_overlap_frames": 8,  # frames blended between temporal chunks
+            "chunk_batch_size": 2,  # temporal chunks per batched pipeline call
         }
         
         logger.info(f"Enhanced WAN 2.1 T2B 1.3B initialized for {device}")
@@ -138,37 +147,8 @@ class RealWAN21VideoGenerator:
         logger.warning("Loading WAN 2.1 in development mode (CPU-compatible)")
         self.development_mode = True
         
-        # Create a mock model for development
-        class MockWAN21Model:
-            def __init__(self, config):
-                self.config = config
-                
-            def generate_video(self, prompt, aspect_ratio="16:9", **kwargs):
-                # Generate synthetic video data
-                width, height = self.config["supported_aspect_ratios"][aspect_ratio]
-                
-                # Create synthetic video frames
-                frames = []
-                for i in range(24):  # 1 second at 24fps
-                    # Create a synthetic frame with text
-                    frame = np.random.randint(0, 255, (height, width, 3), dtype=np.uint8)
-                    
-                    # Add some pattern based on prompt
-                    if "sunset" in prompt.lower():
-                        frame[:, :, 0] = np.minimum(frame[:, :, 0] + 100, 255)  # More red
-                        frame[:, :, 1] = np.minimum(frame[:, :, 1] + 50, 255)   # Some green
-                    elif "ocean" in prompt.lower():
-                        frame[:, :, 2] = np.minimum(frame[:, :, 2] + 100, 255)  # More blue
-                    elif "forest" in prompt.lower():
-                        frame[:, :, 1] = np.minimum(frame[:, :, 1] + 100, 255)  # More green
-                    
-                    frames.append(frame)
-                
-                return frames
-        
-        self.model = MockWAN21Model({
-            "supported_aspect_ratios": self.supported_aspect_ratios
-        })
+        # Vectorized, seeded synthetic clip engine
+        self.model = SyntheticVideoEngine(self.supported_aspect_ratios)
         
         return True
         
@@ -196,12 +176,50 @@ class RealWAN21VideoGenerator:
             logger.error(f"Failed to load WAN 2.1 model: {e}")
             return False
     
-    def generate_video(self, prompt: str, aspect_ratio: str = "16:9", 
-                      fps: int = 24, guidance_scale: float = 7.5,
-                      num_inference_steps: int = 50, seed: Optional[int] = None,
-                      **kwargs) -> Optional[bytes]:
+    def _render_frames(self, prompt: str, width: int, height: int, num_frames: int,
+                       guidance_scale: float, num_inference_steps: int,
+                       seed: Optional[int], fps: int, batch_size: int = 1) -> List[np.ndarray]:
+        """Render batch_size clips of num_frames frames (seeds seed, seed + 1, ...)"""
+        if self.development_mode:
+            # Development mode - synthetic generation, one thread per clip
+            def render(index):
+                return self.model.generate_video(
+                    prompt, num_frames=num_frames, fps=fps, resolution=(width, height),
+                    seed=seed + index if seed is not None else None
+                )
+            if batch_size == 1:
+                return [render(0)]
+            with ThreadPoolExecutor(max_workers=min(batch_size, os.cpu_count() or 1)) as executor:
+                return list(executor.map(render, range(batch_size)))
+        
+        # Production mode - real model inference, chunks batched as videos per prompt
+        videos = self.model(
+            prompt=prompt,
+            num_inference_steps=num_inference_steps,
+            guidance_scale=guidance_scale,
+            width=width,
+            height=height,
+            num_frames=num_frames,
+            num_videos_per_prompt=batch_size,
+            output_type="np",
+            generator=torch.Generator(device=self.device).manual_seed(seed) if seed else None,
+        ).frames
+        return [to_uint8_frames(video) for video in videos]
+    
+    def generate_frames(self, prompt: str, aspect_ratio: str = "16:9",
+                        fps: int = 24, guidance_scale: float = 7.5,
+                        num_inference_steps: int = 50, seed: Optional[int] = None,
+                        num_frames: Optional[int] = None, duration: Optional[float] = None,
+                        render_fps: Optional[int] = None, render_scale: float = 1.0,
+                        **kwargs) -> Optional[Tuple[np.ndarray, Dict[str, Any]]]:
         """
-        Generate video from text prompt using WAN 2.1 T2B 1.3B
+        Generate a clip as a frame array using WAN 2.1 T2B 1.3B
+        
+        Clips longer than the model's max_frames are rendered as overlapping
+        chunks of valid 4n+1 length and blended at the seams. With render_fps
+        below fps, the model renders fewer frames and the rest are synthesized
+        by optical-flow interpolation. With render_scale below 1, the model
+        renders a smaller frame and the clip is upscaled with Lanczos.
         
         Args:
             prompt: Text description of the video
@@ -210,9 +228,13 @@ class RealWAN21VideoGenerator:
             guidance_scale: Classifier-free guidance scale
             num_inference_steps: Number of denoising steps
             seed: Random seed for reproducible results
+            num_frames: Exact number of frames (takes precedence over duration)
+            duration: Clip duration in seconds (default: 1 second)
+            render_fps: Frame rate actually rendered by the model (default: fps)
+            render_scale: Fraction of the output resolution rendered by the model
             
         Returns:
-            bytes: Generated video data (MP4 format)
+            Tuple of uint8 RGB frames (frames, height, width, 3) and render info
         """
         if not self.loaded:
             logger.error("WAN 2.1 model not loaded")
@@ -230,83 +252,113 @@ class RealWAN21VideoGenerator:
                 torch.manual_seed(seed)
                 np.random.seed(seed)
             
+            width, height = self.supported_aspect_ratios[aspect_ratio]
+            render_width, render_height = width, height
+            if render_scale < 1.0:
+                render_width, render_height = scaled_resolution(width, height, render_scale)
+            total_frames = SyntheticVideoEngine.resolve_num_frames(num_frames, fps, duration)
+            
+            interpolate = render_fps is not None and 0 < render_fps < fps
+            render_fps = render_fps if interpolate else fps
+            render_frames = rendered_frame_count(total_frames, fps, render_fps) if interpolate else total_frames
+            plan = plan_temporal_chunks(
+                render_frames, self.model_specs["max_frames"], self.config["chunk_overlap_frames"]
+            )
+            
+            # Synthetic clips are deterministic per seed, so unseeded chunks still need distinct seeds
             if self.development_mode:
-                # Development mode - synthetic generation
-                frames = self.model.generate_video(prompt, aspect_ratio, **kwargs)
-                
-                # Convert frames to video
-                width, height = self.supported_aspect_ratios[aspect_ratio]
-                
-                # Create temporary video file
-                with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as tmp_file:
-                    tmp_path = tmp_file.name
-                
-                # Use OpenCV to create video
-                fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-                out = cv2.VideoWriter(tmp_path, fourcc, fps, (width, height))
-                
-                for frame in frames:
-                    # Convert RGB to BGR for OpenCV
-                    frame_bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-                    out.write(frame_bgr)
-                
-                out.release()
-                
-                # Read video file and return as bytes
-                with open(tmp_path, 'rb') as f:
-                    video_data = f.read()
-                
-                # Clean up temporary file
-                os.unlink(tmp_path)
-                
-                logger.info(f"Generated {len(video_data)} bytes of video data (development mode)")
-                return video_data
-                
-            else:
-                # Production mode - real model inference
-                width, height = self.supported_aspect_ratios[aspect_ratio]
-                
-                # Generate video using real model
-                video_frames = self.model(
-                    prompt=prompt,
-                    num_inference_steps=num_inference_steps,
-                    guidance_scale=guidance_scale,
-                    width=width,
-                    height=height,
-                    num_frames=fps,  # 1 second of video
-                    generator=torch.Generator(device=self.device).manual_seed(seed) if seed else None,
-                ).frames[0]
-                
-                # Convert frames to video bytes
-                with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as tmp_file:
-                    tmp_path = tmp_file.name
-                
-                # Use OpenCV to create video
-                fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-                out = cv2.VideoWriter(tmp_path, fourcc, fps, (width, height))
-                
-                for frame in video_frames:
-                    # Convert PIL Image to OpenCV format
-                    frame_array = np.array(frame)
-                    frame_bgr = cv2.cvtColor(frame_array, cv2.COLOR_RGB2BGR)
-                    out.write(frame_bgr)
-                
-                out.release()
-                
-                # Read video file and return as bytes
-                with open(tmp_path, 'rb') as f:
-                    video_data = f.read()
-                
-                # Clean up temporary file
-                os.unlink(tmp_path)
-                
-                logger.info(f"Generated {len(video_data)} bytes of video data (production mode)")
-                return video_data
+                seed = prompt_seed(prompt, seed)
+            
+            started = time.perf_counter()
+            chunks = []
+            batch_size = self.config["chunk_batch_size"]
+            for offset in range(0, len(plan), batch_size):
+                chunks.extend(self._render_frames(
+                    prompt, render_width, render_height, plan[0][1], guidance_scale, num_inference_steps,
+                    seed + offset if seed is not None else None, render_fps,
+                    batch_size=min(batch_size, len(plan) - offset)
+                ))
+            frames = blend_chunks(chunks, plan, render_frames)
+            render_seconds = time.perf_counter() - started
+            
+            info = {
+                "num_frames": total_frames,
+                "fps": fps,
+                "render_fps": render_fps,
+                "resolution": f"{width}x{height}",
+                "render_resolution": f"{render_width}x{render_height}",
+                "chunks": len(plan),
+                "rendered_frames": len(plan) * plan[0][1],
+                "render_seconds": render_seconds,
+            }
+            
+            if interpolate:
+                started = time.perf_counter()
+                frames = interpolate_frames(frames, render_fps, fps, total_frames)
+                info["interpolation_seconds"] = time.perf_counter() - started
+                
+                # Compare with the chunks a full-rate render would have needed
+                full_plan = plan_temporal_chunks(
+                    total_frames, self.model_specs["max_frames"], self.config["chunk_overlap_frames"]
+                )
+                per_frame = render_seconds / info["rendered_frames"]
+                full_seconds = per_frame * len(full_plan) * full_plan[0][1]
+                info["estimated_seconds_saved"] = full_seconds - render_seconds - info["interpolation_seconds"]
+                logger.info(
+                    f"Interpolated {info['rendered_frames']} -> {total_frames} frames "
+                    f"({render_fps} -> {fps} fps), ~{info['estimated_seconds_saved']:.1f}s saved"
+                )
+            
+            if (render_width, render_height) != (width, height):
+                started = time.perf_counter()
+                frames = upscale_frames(frames, (width, height))
+                info["upscale_seconds"] = time.perf_counter() - started
+            
+            logger.info(f"Rendered {total_frames} frames in {len(plan)} chunk(s) at {info['render_resolution']}")
+            return frames, info
                 
         except Exception as e:
             logger.error(f"Error generating video: {e}")
             return None
     
+    def generate_video(self, prompt: str, aspect_ratio: str = "16:9", 
+                      fps: int = 24, guidance_scale: float = 7.5,
+                      num_inference_steps: int = 50, seed: Optional[int] = None,
+                      num_frames: Optional[int] = None, duration: Optional[float] = None,
+                      **kwargs) -> Optional[bytes]:
+        """
+        Generate video from text prompt using WAN 2.1 T2B 1.3B
+        
+        Args:
+            prompt: Text description of the video
+            aspect_ratio: Video aspect ratio ('16:9' or '9:16')
+            fps: Frames per second
+            num_frames: Exact number of frames (takes precedence over duration)
+            duration: Clip duration in seconds (default: 1 second)
+            guidance_scale: Classifier-free guidance scale
+            num_inference_steps: Number of denoising steps
+            seed: Random seed for reproducible results
+            
+        Returns:
+            bytes: Generated video data (MP4 format)
+        """
+        result = self.generate_frames(
+            prompt, aspect_ratio, fps=fps, guidance_scale=guidance_scale,
+            num_inference_steps=num_inference_steps, seed=seed,
+            num_frames=num_frames, duration=duration, **kwargs
+        )
+        if result is None:
+            return None
+            
+        try:
+            video_data = encode_frames(result[0], fps)
+            mode = "development" if self.development_mode else "production"
+            logger.info(f"Generated {len(video_data)} bytes of video data ({mode} mode)")
+            return video_data
+        except Exception as e:
+            logger.error(f"Error encoding video: {e}")
+            return None
+    
     def get_model_info(self) -> Dict[str, Any]:
         """Get detailed model information"""
         return {
@@ -414,6 +466,8 @@ class RealStableAudioGenerator:
             "channels": 2,
             "latent_dim": 64,
             "num_diffusion_steps": 100,
+            "long_form_overlap": 2.0,  # seconds of crossfade between windows
+            "long_form_batch_size": 4,  # windows per batched pipeline call
         }
         
         logger.info(f"Enhanced Stable Audio Open initialized for {device}")
@@ -477,57 +531,11 @@ class RealStableAudioGenerator:
         logger.warning("Loading Stable Audio Open in development mode")
         self.development_mode = True
         
-        # Create a mock model for development
-        class MockStableAudioModel:
-            def __init__(self, config):
-                self.config = config
-                
-            def generate_audio(self, prompt, duration=10.0, **kwargs):
-                # Generate synthetic audio data
-                sample_rate = self.config["sample_rate"]
-                channels = self.config["channels"]
-                
-                # Create synthetic audio based on prompt
-                num_samples = int(duration * sample_rate)
-                
-                # Generate different types of audio based on prompt
-                if "piano" in prompt.lower():
-                    # Generate piano-like tones
-                    t = np.linspace(0, duration, num_samples)
-                    audio = np.sin(2 * np.pi * 440 * t)  # A4 note
-                    audio += 0.3 * np.sin(2 * np.pi * 880 * t)  # A5 note
-                elif "nature" in prompt.lower() or "forest" in prompt.lower():
-                    # Generate nature sounds
-                    audio = np.random.normal(0, 0.1, num_samples)
-                    # Add some filtering to make it more natural
-                    audio = np.convolve(audio, np.ones(100)/100, mode='same')
-                elif "electronic" in prompt.lower():
-                    # Generate electronic music
-                    t = np.linspace(0, duration, num_samples)
-                    audio = np.sin(2 * np.pi * 200 * t) + 0.5 * np.sin(2 * np.pi * 300 * t)
-                elif "drum" in prompt.lower():
-                    # Generate drum-like sounds
-                    audio = np.random.normal(0, 0.5, num_samples)
-                    # Add some envelope
-                    envelope = np.exp(-t * 3)
-                    audio *= envelope
-                else:
-                    # Default ambient sound
-                    audio = np.random.normal(0, 0.05, num_samples)
-                
-                # Normalize audio
-                audio = audio / np.max(np.abs(audio))
-                
-                # Make stereo
-                if channels == 2:
-                    audio = np.stack([audio, audio], axis=0)
-                
-                return audio
-        
-        self.model = MockStableAudioModel({
-            "sample_rate": self.config["sample_rate"],
-            "channels": self.config["channels"]
-        })
+        # Chunked float32 synthesizer with FFT-based filtering
+        self.model = SyntheticAudioEngine(
+            sample_rate=self.config["sample_rate"],
+            channels=self.config["channels"]
+        )
         
         return True
         
@@ -555,11 +563,87 @@ class RealStableAudioGenerator:
             logger.error(f"Failed to load Stable Audio model: {e}")
             return False
     
-    def generate_audio(self, prompt: str, duration: float = 10.0, 
-                      steps: int = 100, cfg_scale: float = 7.0,
-                      seed: Optional[int] = None) -> bytes:
+    def _render_audio(self, prompt: str, duration: float, steps: int,
+                      cfg_scale: float, seed: Optional[int]) -> np.ndarray:
+        """Render float32 audio shaped (channels, samples)"""
+        if self.development_mode:
+            # Development mode - synthetic generation
+            return self.model.generate_audio(prompt, duration, seed=seed, steps=steps, cfg_scale=cfg_scale)
+        
+        # Production mode - real model inference
+        audio_output = self.model(
+            prompt=prompt,
+            negative_prompt="Low quality, distorted, noisy",
+            num_inference_steps=steps,
+            guidance_scale=cfg_scale,
+            audio_end_in_s=duration,
+            generator=torch.Generator(device=self.device).manual_seed(seed) if seed else None,
+        ).audios[0]
+        
+        if isinstance(audio_output, torch.Tensor):
+            audio_output = audio_output.float().cpu().numpy()
+        return np.asarray(audio_output, dtype=np.float32)
+    
+    def _render_windows(self, prompt: str, windows: List[Tuple[float, float]], steps: int,
+                        cfg_scale: float, seed: Optional[int]) -> List[np.ndarray]:
+        """Render equal-length long-form windows, batched in production and threaded in development"""
+        if self.development_mode:
+            # The synthesizer is deterministic per seed, so unseeded windows still need distinct seeds
+            base_seed = prompt_seed(prompt, seed)
+            with ThreadPoolExecutor(max_workers=min(len(windows), os.cpu_count() or 1)) as executor:
+                return list(executor.map(
+                    lambda index: self._render_audio(
+                        prompt, windows[index][1], steps, cfg_scale, base_seed + index
+                    ),
+                    range(len(windows))
+                ))
+        
+        segments = []
+        batch_size = self.config["long_form_batch_size"]
+        for offset in range(0, len(windows), batch_size):
+            batch = windows[offset:offset + batch_size]
+            generator = None
+            if seed is not None:
+                generator = torch.Generator(device=self.device).manual_seed(seed + offset)
+            
+            # One pipeline call renders several windows as separate waveforms
+            audios = self.model(
+                prompt=prompt,
+                negative_prompt="Low quality, distorted, noisy",
+                num_inference_steps=steps,
+                guidance_scale=cfg_scale,
+                audio_end_in_s=batch[0][1],
+                num_waveforms_per_prompt=len(batch),
+                generator=generator,
+            ).audios
+            
+            for audio_output in audios:
+                if isinstance(audio_output, torch.Tensor):
+                    audio_output = audio_output.float().cpu().numpy()
+                segments.append(np.asarray(audio_output, dtype=np.float32))
+        return segments
+    
+    def _render_long_audio(self, prompt: str, duration: float, steps: int,
+                           cfg_scale: float, seed: Optional[int]) -> np.ndarray:
+        """Render audio longer than the model limit as crossfaded overlapping windows"""
+        sample_rate = self.config["sample_rate"]
+        overlap = self.config["long_form_overlap"]
+        windows = plan_windows(duration, self.model_specs["max_duration"], overlap)
+        
+        logger.info(f"Long-form audio: {len(windows)} windows of {windows[0][1]}s for {duration}s")
+        segments = self._render_windows(prompt, windows, steps, cfg_scale, seed)
+        
+        # Windows share one length, so trim any sample-count jitter before stitching
+        window_samples = min(segment.shape[-1] for segment in segments)
+        segments = [segment[..., :window_samples] for segment in segments]
+        return stitch_crossfade(segments, int(overlap * sample_rate), int(duration * sample_rate))
+    
+    def generate_audio_array(self, prompt: str, duration: float = 10.0,
+                             steps: int = 100, cfg_scale: float = 7.0,
+                             seed: Optional[int] = None,
+                             long_form: Optional[bool] = None) -> Optional[np.ndarray]:
         """
-        Generate audio from text prompt
+        Generate audio from text prompt as raw float samples
         
         Args:
             prompt: Text description of the audio
@@ -567,9 +651,10 @@ class RealStableAudioGenerator:
             steps: Number of diffusion steps
             cfg_scale: Classifier-free guidance scale
             seed: Random seed for reproducible results
+            long_form: Render as crossfaded windows (default: when duration exceeds max_duration)
             
         Returns:
-            bytes: Generated audio data (WAV format)
+            np.ndarray: float32 audio shaped (channels, samples) at config["sample_rate"]
         """
         if not self.loaded:
             logger.error("Stable Audio model not loaded")
@@ -583,84 +668,53 @@ class RealStableAudioGenerator:
                 torch.manual_seed(seed)
                 np.random.seed(seed)
             
-            if self.development_mode:
-                # Development mode - synthetic generation
-                audio_data = self.model.generate_audio(prompt, duration, steps=steps, cfg_scale=cfg_scale)
-                
-                # Convert to WAV format
-                import wave
-                import struct
-                
-                # Create temporary WAV file
-                with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp_file:
-                    tmp_path = tmp_file.name
-                
-                # Write WAV file
-                with wave.open(tmp_path, 'w') as wav_file:
-                    wav_file.setnchannels(self.config["channels"])
-                    wav_file.setsampwidth(2)  # 16-bit
-                    wav_file.setframerate(self.config["sample_rate"])
-                    
-                    # Convert float to 16-bit int
-                    if audio_data.ndim == 2:  # Stereo
-                        audio_int = (audio_data.T * 32767).astype(np.int16)
-                    else:  # Mono
-                        audio_int = (audio_data * 32767).astype(np.int16)
-                    
-                    wav_file.writeframes(audio_int.tobytes())
-                
-                # Read WAV file and return as bytes
-                with open(tmp_path, 'rb') as f:
-                    wav_data = f.read()
-                
-                # Clean up temporary file
-                os.unlink(tmp_path)
-                
-                logger.info(f"Generated {len(wav_data)} bytes of audio data (development mode)")
-                return wav_data
-                
-            else:
-                # Production mode - real model inference
-                audio_output = self.model(
-                    prompt=prompt,
-                    negative_prompt="Low quality, distorted, noisy",
-                    num_inference_steps=steps,
-                    guidance_scale=cfg_scale,
-                    audio_end_in_s=duration,
-                    generator=torch.Generator(device=self.device).manual_seed(seed) if seed else None,
-                ).audios[0]
-                
-                # Convert to WAV format
-                import wave
-                
-                # Create temporary WAV file
-                with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp_file:
-                    tmp_path = tmp_file.name
-                
-                # Write WAV file
-                with wave.open(tmp_path, 'w') as wav_file:
-                    wav_file.setnchannels(self.config["channels"])
-                    wav_file.setsampwidth(2)  # 16-bit
-                    wav_file.setframerate(self.config["sample_rate"])
-                    
-                    # Convert float to 16-bit int
-                    audio_int = (audio_output.T * 32767).astype(np.int16)
-                    wav_file.writeframes(audio_int.tobytes())
-                
-                # Read WAV file and return as bytes
-                with open(tmp_path, 'rb') as f:
-                    wav_data = f.read()
-                
-                # Clean up temporary file
-                os.unlink(tmp_path)
-                
-                logger.info(f"Generated {len(wav_data)} bytes of audio data (production mode)")
-                return wav_data
+            if long_form is None:
+                long_form = duration > self.model_specs["max_duration"]
+            
+            if long_form:
+                return self._render_long_audio(prompt, duration, steps, cfg_scale, seed)
+            return self._render_audio(prompt, duration, steps, cfg_scale, seed)
                 
         except Exception as e:
             logger.error(f"Error generating audio: {e}")
             return None
     
+    def generate_audio(self, prompt: str, duration: float = 10.0, 
+                      steps: int = 100, cfg_scale: float = 7.0,
+                      seed: Optional[int] = None,
+                      output_format: str = "wav",
+                      long_form: Optional[bool] = None) -> Optional[Union[bytearray, bytes]]:
+        """
+        Generate audio from text prompt
+        
+        Args:
+            prompt: Text description of the audio
+            duration: Duration in seconds
+            steps: Number of diffusion steps
+            cfg_scale: Classifier-free guidance scale
+            seed: Random seed for reproducible results
+            output_format: 'wav' (16-bit PCM), 'opus' or 'aac'
+            long_form: Render as crossfaded windows (default: when duration exceeds max_duration)
+            
+        Returns:
+            Encoded audio as a buffer-protocol object, encoded in memory
+        """
+        audio = self.generate_audio_array(prompt, duration, steps, cfg_scale, seed, long_form)
+        if audio is None:
+            return None
+            
+        try:
+            audio_data = encode_audio(audio, self.config["sample_rate"], output_format)
+            
+            if audio_data is not None:
+                mode = "development" if self.development_mode else "production"
+                logger.info(f"Generated {len(audio_data)} bytes of {output_format} audio data ({mode} mode)")
+            return audio_data
+                
+        except Exception as e:
+            logger.error(f"Error encoding audio: {e}")
+            return None
+    
     def get_model_info(self) -> Dict[str, Any]:
         """Get detailed model information"""
         return {
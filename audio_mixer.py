@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Audio Mixing Engine for Script-to-Video
+Places decoded stems on a timeline, ducks beds under the voice-over and
+normalizes loudness in-process, producing one PCM stream for the final mux
+"""
+import logging
+import numpy as np
+from scipy.signal import sosfilt
+from typing import Dict, Any, Optional, List
+
+logger = logging.getLogger(__name__)
+
+# Stem roles: the voice bus is the ducking sidechain, every other role is a bed
+VOICE_ROLE = "voice"
+
+MIXER_DEFAULTS = {
+    "target_lufs": -16.0,  # integrated loudness target (EBU R128 style)
+    "peak_ceiling_db": -1.0,  # sample peak ceiling after normalization
+    "duck_depth_db": -12.0,  # bed attenuation while the voice is active
+    "duck_threshold_db": -40.0,  # voice block RMS considered active
+    "duck_attack": 0.05,  # seconds to reach full ducking
+    "duck_release": 0.4,  # seconds to recover after the voice stops
+    "duck_block": 0.01,  # envelope resolution in seconds
+}
+
+
+def k_weighting_sos(sample_rate: int) -> np.ndarray:
+    """
+    ITU-R BS.1770 K-weighting filter (high shelf + high pass) for any sample rate
+
+    Returns:
+        np.ndarray: Second-order sections for scipy.signal.sosfilt
+    """
+    # Stage 1: high shelf modelling the head
+    gain_db, q, fc = 3.99984385397, 0.7071752369554193, 1681.9744509555319
+    k = np.tan(np.pi * fc / sample_rate)
+    vh = 10 ** (gain_db / 20)
+    vb = vh ** 0.499666774155
+    a0 = 1 + k / q + k * k
+    shelf = [(vh + vb * k / q + k * k) / a0, 2 * (k * k - vh) / a0, (vh - vb * k / q + k * k) / a0,
+             1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0]
+
+    # Stage 2: RLB high pass
+    q, fc = 0.5003270373253953, 38.13547087613982
+    k = np.tan(np.pi * fc / sample_rate)
+    a0 = 1 + k / q + k * k
+    high_pass = [1.0, -2.0, 1.0, 1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0]
+
+    return np.array([shelf, high_pass])
+
+
+def integrated_loudness(audio: np.ndarray, sample_rate: int) -> float:
+    """
+    Gated integrated loudness in LUFS (BS.1770: 400 ms blocks, 75% overlap,
+    -70 LUFS absolute gate, -10 LU relative gate)
+
+    Args:
+        audio: float32 audio shaped (channels, samples)
+        sample_rate: Sample rate in Hz
+
+    Returns:
+        float: Integrated loudness, or -inf for silence or very short audio
+    """
+    block, step = int(0.4 * sample_rate), int(0.1 * sample_rate)
+    if audio.shape[1] < block:
+        return float("-inf")
+
+    weighted = sosfilt(k_weighting_sos(sample_rate), audio, axis=1).astype(np.float32, copy=False)
+
+    # Mean square per block from a cumulative sum over the channel-summed energy
+    energy = np.cumsum(np.square(weighted, dtype=np.float64).sum(axis=0))
+    energy = np.concatenate(([0.0], energy))
+    starts = np.arange(0, audio.shape[1] - block + 1, step)
+    z = (energy[starts + block] - energy[starts]) / block
+
+    with np.errstate(divide="ignore"):
+        loudness = -0.691 + 10 * np.log10(z)
+    gated = z[loudness > -70.0]
+    if not len(gated):
+        return float("-inf")
+
+    relative_gate = -0.691 + 10 * np.log10(gated.mean()) - 10.0
+    with np.errstate(divide="ignore"):
+        gated = gated[-0.691 + 10 * np.log10(gated) > relative_gate]
+    return float(-0.691 + 10 * np.log10(gated.mean()))
+
+
+class AudioMixer:
+    """
+    Timeline mixer for decoded stems
+
+    Stems are float32 arrays added once into a voice bus or a bed bus at their
+    scene offsets. The bed bus is ducked by a gain curve derived from the voice
+    bus envelope, the buses are summed and the result is normalized to the
+    target loudness with a peak ceiling.
+    """
+
+    def __init__(self, sample_rate: int = 44100, channels: int = 2,
+                 settings: Optional[Dict[str, Any]] = None):
+        """
+        Initialize audio mixer
+
+        Args:
+            sample_rate: Sample rate shared by all stems
+            channels: Output channel count
+            settings: Overrides for MIXER_DEFAULTS
+        """
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.settings = {**MIXER_DEFAULTS, **(settings or {})}
+        self.stems: List[Dict[str, Any]] = []
+
+    def add_stem(self, audio: np.ndarray, offset: float = 0.0,
+                 role: str = VOICE_ROLE, gain_db: float = 0.0):
+        """
+        Place a decoded stem on the timeline
+
+        Args:
+            audio: float audio shaped (channels, samples) or (samples,) at the mixer rate
+            offset: Start time in seconds
+            role: 'voice' for the ducking sidechain, anything else is a bed (e.g. 'sfx', 'music')
+            gain_db: Static stem gain
+        """
+        if audio.ndim == 1:
+            audio = audio[None, :]
+        self.stems.append({
+            "audio": audio,
+            "start": int(round(offset * self.sample_rate)),
+            "role": role,
+            "gain": np.float32(10 ** (gain_db / 20)),
+        })
+
+    @property
+    def duration(self) -> float:
+        """Timeline length in seconds"""
+        end = max((stem["start"] + stem["audio"].shape[1] for stem in self.stems), default=0)
+        return end / self.sample_rate
+
+    def _add_to_bus(self, bus: np.ndarray, stem: Dict[str, Any]):
+        """Add a stem into a bus, broadcasting mono stems and clipping at the timeline end"""
+        start = stem["start"]
+        length = min(stem["audio"].shape[1], bus.shape[1] - start)
+        if length <= 0:
+            return
+        target = bus[:, start:start + length]
+        if stem["gain"] != 1:
+            target += stem["audio"][:, :length] * stem["gain"]
+        else:
+            target += stem["audio"][:, :length]
+
+    @staticmethod
+    def _moving_average(values: np.ndarray, length: int) -> np.ndarray:
+        """Causal moving average, padded with the first value"""
+        padded = np.concatenate((np.full(length - 1, values[0]), values))
+        return np.convolve(padded, np.ones(length) / length, mode="valid")
+
+    def _duck_gain(self, voice: np.ndarray) -> np.ndarray:
+        """Per-sample bed gain: depth while the voice is active, smoothed by attack/release"""
+        settings = self.settings
+        block = max(1, int(settings["duck_block"] * self.sample_rate))
+        blocks = voice.shape[1] // block
+        if blocks == 0:
+            return np.ones(voice.shape[1], dtype=np.float32)
+
+        # Block RMS of the channel-averaged voice bus
+        mono = voice[:, :blocks * block].mean(axis=0).reshape(blocks, block)
+        rms = np.sqrt(np.mean(np.square(mono), axis=1))
+        active = rms > 10 ** (settings["duck_threshold_db"] / 20)
+
+        # Attack extends the active region backwards (look-ahead), release forwards (hang):
+        # block i is ducked when the voice is active anywhere in [i - release, i + attack]
+        attack = max(1, int(round(settings["duck_attack"] / settings["duck_block"])))
+        release = max(1, int(round(settings["duck_release"] / settings["duck_block"])))
+        kernel = np.ones(attack + release + 1)
+        spread = np.convolve(active.astype(np.float64), kernel, mode="full")[attack:attack + blocks] > 0
+
+        # Ramp down over the attack time and back up over the release time (the lower of
+        # the two moving averages follows the faster fall and the slower rise)
+        depth = 10 ** (settings["duck_depth_db"] / 20)
+        target = np.where(spread, depth, 1.0)
+        smoothed = np.minimum(self._moving_average(target, attack), self._moving_average(target, release))
+        positions = (np.arange(blocks) + 0.5) * block
+        return np.interp(np.arange(voice.shape[1]), positions, smoothed).astype(np.float32)
+
+    def render(self, duration: Optional[float] = None, normalize: bool = True) -> np.ndarray:
+        """
+        Render the mix
+
+        Args:
+            duration: Output length in seconds (default: end of the last stem)
+            normalize: Apply loudness normalization and the peak ceiling
+
+        Returns:
+            np.ndarray: float32 audio shaped (channels, samples)
+        """
+        total = int(round((duration if duration is not None else self.duration) * self.sample_rate))
+        mix = np.zeros((self.channels, total), dtype=np.float32)
+        beds = None
+
+        for stem in self.stems:
+            if stem["role"] == VOICE_ROLE:
+                self._add_to_bus(mix, stem)
+            else:
+                if beds is None:
+                    beds = np.zeros_like(mix)
+                self._add_to_bus(beds, stem)
+
+        if beds is not None:
+            beds *= self._duck_gain(mix)
+            mix += beds
+            del beds
+
+        if normalize:
+            self._normalize(mix)
+        return mix
+
+    def _normalize(self, mix: np.ndarray):
+        """Scale the mix in place to the target loudness, then under the peak ceiling"""
+        loudness = integrated_loudness(mix, self.sample_rate)
+        if not np.isfinite(loudness):
+            return
+
+        gain = 10 ** ((self.settings["target_lufs"] - loudness) / 20)
+        peak = float(np.abs(mix).max()) * gain
+        ceiling = 10 ** (self.settings["peak_ceiling_db"] / 20)
+        if peak > ceiling:
+            gain *= ceiling / peak
+        mix *= np.float32(gain)
+        logger.info(f"Mix loudness {loudness:.1f} LUFS, applied {20 * np.log10(gain):+.1f} dB")
+
+
+def to_pcm_bytes(audio: np.ndarray) -> memoryview:
+    """Interleave float32 audio (channels, samples) into an f32le byte view for FFmpeg"""
+    return memoryview(np.ascontiguousarray(audio.T, dtype="<f4")).cast("B")
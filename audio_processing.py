@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Audio Processing Utilities for Script-to-Video
+In-memory encoding of generated float audio without temporary files
+"""
+import struct
+import logging
+import subprocess
+import numpy as np
+from typing import List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+WAV_HEADER_SIZE = 44
+
+# Codec name -> (ffmpeg encoder arguments, container format, MIME type)
+COMPRESSED_FORMATS = {
+    "opus": (["-c:a", "libopus", "-b:a", "96k"], "ogg", "audio/ogg"),
+    "aac": (["-c:a", "aac", "-b:a", "128k"], "adts", "audio/aac"),
+}
+
+# Samples converted per block when filling the int16 buffer
+_CONVERT_BLOCK = 1 << 16
+
+
+def audio_content_type(output_format: str) -> str:
+    """MIME type for an output format"""
+    if output_format == "wav":
+        return "audio/wav"
+    return COMPRESSED_FORMATS[output_format][2]
+
+
+def _as_channels_first(audio: np.ndarray) -> np.ndarray:
+    """Return audio shaped (channels, samples)"""
+    if audio.ndim == 1:
+        return audio[None, :]
+    return audio
+
+
+def encode_wav(audio: np.ndarray, sample_rate: int) -> bytearray:
+    """
+    Encode float audio as 16-bit PCM WAV in memory
+
+    The header and the interleaved int16 samples share one bytearray; samples are
+    converted block by block straight into it, so no full-length int16 or
+    transposed copy is ever made.
+
+    Args:
+        audio: Float audio in [-1, 1], shaped (channels, samples) or (samples,)
+        sample_rate: Sample rate in Hz
+
+    Returns:
+        bytearray: Complete WAV file
+    """
+    audio = _as_channels_first(audio)
+    channels, num_samples = audio.shape
+    data_size = num_samples * channels * 2
+
+    buffer = bytearray(WAV_HEADER_SIZE + data_size)
+    struct.pack_into(
+        "<4sI4s4sIHHIIHH4sI", buffer, 0,
+        b"RIFF", WAV_HEADER_SIZE - 8 + data_size, b"WAVE",
+        b"fmt ", 16, 1, channels, sample_rate,
+        sample_rate * channels * 2, channels * 2, 16,
+        b"data", data_size,
+    )
+
+    samples = np.frombuffer(buffer, dtype="<i2", offset=WAV_HEADER_SIZE).reshape(num_samples, channels)
+    for start in range(0, num_samples, _CONVERT_BLOCK):
+        block = np.clip(audio[:, start:start + _CONVERT_BLOCK].T, -1.0, 1.0)
+        block *= 32767
+        np.copyto(samples[start:start + _CONVERT_BLOCK], block, casting="unsafe")
+
+    return buffer
+
+
+def encode_compressed(audio: np.ndarray, sample_rate: int, codec: str = "opus") -> Optional[bytes]:
+    """
+    Encode float audio to Opus or AAC in memory by piping PCM through FFmpeg
+
+    Args:
+        audio: Float audio in [-1, 1], shaped (channels, samples) or (samples,)
+        sample_rate: Sample rate in Hz
+        codec: 'opus' or 'aac'
+
+    Returns:
+        bytes: Encoded audio, or None if FFmpeg failed
+    """
+    encoder_args, container, _ = COMPRESSED_FORMATS[codec]
+    audio = _as_channels_first(audio)
+    interleaved = np.ascontiguousarray(audio.T, dtype=np.float32)
+
+    cmd = [
+        'ffmpeg', '-loglevel', 'error',
+        '-f', 'f32le', '-ar', str(sample_rate), '-ac', str(audio.shape[0]), '-i', 'pipe:0',
+        *encoder_args, '-f', container, 'pipe:1'
+    ]
+
+    result = subprocess.run(cmd, input=memoryview(interleaved).cast("B"), capture_output=True)
+    if result.returncode != 0:
+        logger.error(f"FFmpeg {codec} encoding error: {result.stderr.decode(errors='replace')}")
+        return None
+    return result.stdout
+
+
+def encode_audio(audio: np.ndarray, sample_rate: int,
+                 output_format: str = "wav") -> Optional[Union[bytearray, bytes]]:
+    """
+    Encode float audio in memory
+
+    Args:
+        audio: Float audio in [-1, 1], shaped (channels, samples) or (samples,)
+        sample_rate: Sample rate in Hz
+        output_format: 'wav', 'opus' or 'aac'
+
+    Returns:
+        Buffer-protocol object holding the encoded file
+    """
+    if output_format == "wav":
+        return encode_wav(audio, sample_rate)
+    if output_format in COMPRESSED_FORMATS:
+        return encode_compressed(audio, sample_rate, output_format)
+    raise ValueError(f"Unsupported audio format: {output_format}")
+
+
+def decode_audio(source: Union[bytes, bytearray, str], sample_rate: int,
+                 channels: int = 2) -> Optional[np.ndarray]:
+    """
+    Decode any FFmpeg-readable audio to float32 in one pass
+
+    Args:
+        source: Encoded audio bytes or a file path
+        sample_rate: Output sample rate in Hz (resampled by FFmpeg)
+        channels: Output channel count
+
+    Returns:
+        np.ndarray: float32 audio shaped (channels, samples), or None if decoding failed
+    """
+    from_pipe = not isinstance(source, str)
+    cmd = [
+        'ffmpeg', '-loglevel', 'error', '-i', 'pipe:0' if from_pipe else source,
+        '-f', 'f32le', '-ar', str(sample_rate), '-ac', str(channels), 'pipe:1'
+    ]
+
+    result = subprocess.run(cmd, input=source if from_pipe else None, capture_output=True)
+    if result.returncode != 0:
+        logger.error(f"FFmpeg decoding error: {result.stderr.decode(errors='replace')}")
+        return None
+    return np.frombuffer(result.stdout, dtype="<f4").reshape(-1, channels).T
+
+
+def plan_windows(duration: float, window: float, overlap: float) -> List[Tuple[float, float]]:
+    """
+    Split a duration into equal overlapping windows
+
+    Args:
+        duration: Total duration in seconds
+        window: Window length in seconds
+        overlap: Overlap between consecutive windows in seconds
+
+    Returns:
+        List of (start, length) tuples in seconds; the last window may run past duration
+    """
+    if duration <= window:
+        return [(0.0, duration)]
+    step = window - overlap
+    count = int(np.ceil((duration - overlap) / step))
+    return [(index * step, window) for index in range(count)]
+
+
+def equal_power_fades(length: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Equal-power (sin/cos) fade-in and fade-out curves"""
+    theta = np.linspace(0, np.pi / 2, length, dtype=np.float32)
+    return np.sin(theta), np.cos(theta)
+
+
+def stitch_crossfade(segments: List[np.ndarray], overlap: int,
+                     total: Optional[int] = None) -> np.ndarray:
+    """
+    Join overlapping audio segments with equal-power crossfades
+
+    Args:
+        segments: Float audio segments shaped (channels, samples), in order
+        overlap: Overlap between consecutive segments in samples
+        total: Optional output length in samples (output is trimmed to it)
+
+    Returns:
+        np.ndarray: float32 audio shaped (channels, samples)
+    """
+    segments = [_as_channels_first(segment) for segment in segments]
+    length = sum(segment.shape[1] for segment in segments) - overlap * (len(segments) - 1)
+    output = np.empty((segments[0].shape[0], length), dtype=np.float32)
+    fade_in, fade_out = equal_power_fades(overlap)
+
+    position = 0
+    for index, segment in enumerate(segments):
+        if index == 0 or overlap == 0:
+            output[:, position:position + segment.shape[1]] = segment
+        else:
+            seam = output[:, position:position + overlap]
+            seam *= fade_out
+            seam += segment[:, :overlap] * fade_in
+            output[:, position + overlap:position + segment.shape[1]] = segment[:, overlap:]
+        position += segment.shape[1] - overlap
+
+    return output[:, :total] if total is not None else output
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Admission Control for Script-to-Video
+Estimates the compute cost of a generation before it is accepted and keeps
+the backlog and each client's share of it bounded
+"""
+import re
+import time
+import logging
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Cost model, in worker-seconds
+COST_PROFILE = {
+    "words_per_second": 2.5,  # voice-over pace; drives scene durations
+    "sentences_per_scene": 3,  # script analysis groups roughly this many sentences per scene
+    "render_per_output_second": 30.0,  # full-resolution, 24 fps, 50-step render per second of video
+    "scene_overhead": 6.0,  # prompt rewrite, TTS, sound effects and encoding per scene
+    "reframe_per_output_second": 0.5,  # each extra output aspect ratio
+    "draft_fraction": 0.25 ** 2 * 8 / 24 * 10 / 50,  # progressive draft relative to a full render
+}
+
+
+def estimate_job_cost(script: str, render_scale: float = 1.0, render_fps: Optional[int] = None,
+                      extra_outputs: int = 0, progressive: bool = False,
+                      profile: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+    """
+    Estimate a generation's compute cost from its script and render profile
+
+    Args:
+        script: Script text
+        render_scale: Fraction of the output resolution rendered
+        render_fps: Render frame rate (None: full 24 fps)
+        extra_outputs: Output aspect ratios derived from the master render
+        progressive: Whether a draft pass runs first
+        profile: Overrides for COST_PROFILE
+
+    Returns:
+        Dict with scenes, duration (seconds of video) and cost (worker-seconds)
+    """
+    profile = {**COST_PROFILE, **(profile or {})}
+    words = len(script.split())
+    sentences = max(1, len(re.findall(r"[.!?]+(?:\s|$)", script)))
+    scenes = max(1, round(sentences / profile["sentences_per_scene"]))
+    duration = max(float(scenes), words / profile["words_per_second"])
+
+    render = duration * profile["render_per_output_second"] * render_scale ** 2 * (render_fps or 24) / 24
+    if progressive:
+        render += duration * profile["render_per_output_second"] * profile["draft_fraction"]
+    cost = (render + scenes * profile["scene_overhead"]
+            + extra_outputs * duration * profile["reframe_per_output_second"])
+    return {"scenes": scenes, "duration": round(duration, 1), "cost": round(cost, 1)}
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at rate tokens per second up to capacity"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount tokens are available (0 if they are now)"""
+        self._refill()
+        return max(0.0, (min(amount, self.capacity) - self.tokens) / self.rate)
+
+    def full(self) -> bool:
+        """Whether the bucket has refilled completely (and is indistinguishable from a new one)"""
+        self._refill()
+        return self.tokens >= self.capacity
+
+    def take(self, amount: float):
+        """Remove tokens; a job larger than the bucket drains it completely"""
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+
+@dataclass
+class AdmissionDecision:
+    admitted: bool
+    cost: float
+    eta_seconds: float = 0.0
+    retry_after: float = 0.0
+    reason: str = ""
+
+
+class AdmissionController:
+    """
+    Cost-based admission control
+
+    The backlog is the summed estimated cost of admitted, unfinished jobs.
+    A job is admitted while the backlog it joins can be worked off by the
+    workers within max_wait seconds; admitted jobs get an ETA. Each client
+    also has a token bucket of worker-seconds, so one caller cannot take the
+    whole budget. Rejections carry the seconds after which a retry would fit.
+    Buckets that have refilled completely are dropped every prune_interval
+    seconds, since a new bucket starts full anyway.
+    """
+
+    def __init__(self, workers: int = 1, max_wait: float = 3600.0,
+                 client_rate: float = 0.5, client_burst: float = 1800.0, prune_interval: float = 60.0):
+        """
+        Initialize admission controller
+
+        Args:
+            workers: Jobs processed concurrently (worker-seconds per second)
+            max_wait: Longest backlog, in seconds of wall time, a new job may join
+            client_rate: Worker-seconds per second each client earns
+            client_burst: Worker-seconds a client may spend at once
+            prune_interval: Seconds between sweeps for full, idle client buckets
+        """
+        self.workers = workers
+        self.max_wait = max_wait
+        self.client_rate = client_rate
+        self.client_burst = client_burst
+        self.outstanding: Dict[str, float] = {}
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.prune_interval = prune_interval
+        self._pruned = time.monotonic()
+        self.stats = {"admitted": 0, "rejected_backlog": 0, "rejected_client": 0}
+
+    @property
+    def backlog(self) -> float:
+        """Estimated worker-seconds of admitted, unfinished work"""
+        return sum(self.outstanding.values())
+
+    def _prune(self):
+        now = time.monotonic()
+        if now - self._pruned < self.prune_interval:
+            return
+        self._pruned = now
+        for client_id in [client_id for client_id, bucket in self.buckets.items() if bucket.full()]:
+            del self.buckets[client_id]
+
+    def _bucket(self, client_id: str) -> TokenBucket:
+        self._prune()
+        if client_id not in self.buckets:
+            self.buckets[client_id] = TokenBucket(self.client_rate, self.client_burst)
+        return self.buckets[client_id]
+
+    def admit(self, client_id: str, job_id: str, cost: float) -> AdmissionDecision:
+        """Admit or reject a job; admitted jobs count toward the backlog until released"""
+        bucket = self._bucket(client_id)
+        client_wait = bucket.wait_time(cost)
+        if client_wait > 0:
+            self.stats["rejected_client"] += 1
+            return AdmissionDecision(False, cost, retry_after=client_wait, reason="Client rate limit exceeded")
+
+        budget = self.workers * self.max_wait
+        backlog = self.backlog
+        if backlog > 0 and backlog + cost > budget:
+            self.stats["rejected_backlog"] += 1
+            return AdmissionDecision(
+                False, cost, retry_after=(backlog + cost - budget) / self.workers, reason="Generation capacity exhausted"
+            )
+
+        bucket.take(cost)
+        self.outstanding[job_id] = cost
+        self.stats["admitted"] += 1
+        return AdmissionDecision(True, cost, eta_seconds=(backlog + cost) / self.workers)
+
+    def release(self, job_id: str):
+        """Remove a finished (or failed) job from the backlog"""
+        self.outstanding.pop(job_id, None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Admission counters for monitoring"""
+        return {
+            "workers": self.workers,
+            "backlog_seconds": round(self.backlog, 1),
+            "outstanding_jobs": len(self.outstanding),
+            "clients": len(self.buckets),
+            **self.stats,
+        }
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Broadcast Hub Benchmark
+Pushes status updates through BroadcastHub to thousands of in-memory sockets
+and reports fan-out throughput, coalescing and delivery latency
+
+Usage:
+    python broadcast_benchmark.py --clients 5000 --generations 10 --updates 200
+"""
+import time
+import asyncio
+import argparse
+import statistics
+
+from status_store import LocalStatusStore
+from broadcast_hub import BroadcastHub
+
+
+class FakeWebSocket:
+    """In-memory socket; slow sockets take send_delay seconds per message"""
+
+    def __init__(self, send_delay: float = 0.0):
+        self.send_delay = send_delay
+        self.received = 0
+        self.last_message = None
+        self.finished_at = None
+        self.closed = asyncio.Event()
+
+    async def send_text(self, message: str):
+        if self.send_delay:
+            await asyncio.sleep(self.send_delay)
+        self.received += 1
+        self.last_message = message
+        if '"status":"completed"' in message:
+            self.finished_at = time.perf_counter()
+            self.closed.set()
+
+    async def receive_text(self):
+        await self.closed.wait()
+        raise ConnectionResetError("client closed")
+
+
+async def run(clients: int, generations: int, updates: int, slow_fraction: float,
+              slow_delay: float, interval: float, queue_size: int):
+    store = LocalStatusStore()
+    hub = BroadcastHub(store, queue_size=queue_size)
+    generation_ids = [f"bench-{index}" for index in range(generations)]
+
+    sockets = []
+    slow_every = int(1 / slow_fraction) if slow_fraction > 0 else 0
+    for index in range(clients):
+        slow = slow_every and index % slow_every == 0
+        sockets.append((generation_ids[index % generations], FakeWebSocket(slow_delay if slow else 0.0)))
+
+    attached = [asyncio.create_task(hub.attach(generation_id, socket)) for generation_id, socket in sockets]
+    await asyncio.sleep(0.1)
+
+    started = time.perf_counter()
+    for step in range(updates):
+        for generation_id in generation_ids:
+            await store.update(generation_id, {
+                "status": "processing",
+                "progress": 100.0 * step / updates,
+                "message": f"Rendering scene {step}",
+            })
+        if interval:
+            await asyncio.sleep(interval)
+    published_at = time.perf_counter()
+    for generation_id in generation_ids:
+        await store.set(generation_id, {"status": "completed", "progress": 100.0})
+
+    await asyncio.wait(attached, timeout=60)
+    elapsed = time.perf_counter() - started
+
+    latencies = [socket.finished_at - published_at for _, socket in sockets if socket.finished_at]
+    received = sum(socket.received for _, socket in sockets)
+    stats = hub.snapshot()
+    print(f"clients={clients} generations={generations} updates/generation={updates + 1}")
+    print(f"published in {published_at - started:.2f}s, all delivered in {elapsed:.2f}s")
+    print(f"messages sent={received} ({received / elapsed:,.0f}/s), coalesced={stats['coalesced']}, dropped={stats['dropped']}")
+    print(f"clients that saw the final status: {len(latencies)}/{clients}")
+    if latencies:
+        latencies.sort()
+        print(f"final status latency p50={statistics.median(latencies) * 1000:.1f}ms "
+              f"p99={latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the WebSocket broadcast hub")
+    parser.add_argument("--clients", type=int, default=5000)
+    parser.add_argument("--generations", type=int, default=10)
+    parser.add_argument("--updates", type=int, default=200)
+    parser.add_argument("--slow-fraction", type=float, default=0.05, help="Fraction of clients with slow sends")
+    parser.add_argument("--slow-delay", type=float, default=0.05, help="Seconds per send for slow clients")
+    parser.add_argument("--interval", type=float, default=0.001, help="Seconds between update rounds")
+    parser.add_argument("--queue-size", type=int, default=16)
+    args = parser.parse_args()
+    asyncio.run(run(args.clients, args.generations, args.updates, args.slow_fraction,
+                    args.slow_delay, args.interval, args.queue_size))
+
+
+if __name__ == "__main__":
+    main()
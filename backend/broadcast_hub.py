@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+WebSocket Broadcast Hub for Script-to-Video
+Fans generation status updates out to any number of clients per generation
+with bounded, coalescing per-client send queues
+"""
+import json
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Dict, Any, Deque, Set
+
+from status_store import StatusStore
+
+logger = logging.getLogger(__name__)
+
+
+class HubClient:
+    """
+    One connected client with a bounded queue of serialized status messages
+
+    Statuses are full snapshots, so when a slow client falls behind the queue
+    is collapsed to the newest message instead of growing or blocking others.
+    """
+
+    def __init__(self, websocket, queue_size: int):
+        self.websocket = websocket
+        self.queue_size = queue_size
+        self.pending: Deque[str] = deque()
+        self.ready = asyncio.Event()
+        self.coalesced = 0
+
+    def offer(self, message: str):
+        """Queue a message without ever blocking the publisher"""
+        if len(self.pending) >= self.queue_size:
+            self.coalesced += len(self.pending)
+            self.pending.clear()
+        self.pending.append(message)
+        self.ready.set()
+
+    async def send_loop(self, send_timeout: float, stats: Dict[str, int]):
+        """Send queued messages until the client fails or is too slow to take one"""
+        while True:
+            await self.ready.wait()
+            self.ready.clear()
+            while self.pending:
+                message = self.pending.popleft()
+                await asyncio.wait_for(self.websocket.send_text(message), send_timeout)
+                stats["sent"] += 1
+
+    async def receive_loop(self):
+        """Drain client messages; returns or raises when the client disconnects"""
+        while True:
+            await self.websocket.receive_text()
+
+
+class Channel:
+    """Local clients of one generation and the newest message sent to them"""
+
+    def __init__(self):
+        self.clients: Set[HubClient] = set()
+        self.version = 0
+        self.latest = None
+
+    def publish(self, status: Dict[str, Any]):
+        """Serialize a status once and offer it to every client, ignoring stale versions"""
+        if status.get("version", 0) <= self.version:
+            return
+        self.version = status.get("version", 0)
+        self.latest = json.dumps(status, default=str, separators=(",", ":"))
+        for client in self.clients:
+            client.offer(self.latest)
+
+
+class BroadcastHub:
+    """
+    Per-process fan-out of status updates
+
+    Each generation with at least one local client has a single status store
+    subscription; every update is serialized once and offered to all of its
+    clients. The hub also records that the generation is being watched, once
+    per generation rather than once per client.
+    """
+
+    def __init__(self, store: StatusStore, queue_size: int = 16, send_timeout: float = 10.0,
+                 touch_interval: float = 30.0):
+        """
+        Initialize broadcast hub
+
+        Args:
+            store: Status store providing snapshots and subscriptions
+            queue_size: Messages buffered per client before coalescing
+            send_timeout: Seconds a single send may take before the client is dropped
+            touch_interval: Seconds between 'watched' marks while clients are connected
+        """
+        self.store = store
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        self.touch_interval = touch_interval
+        self.channels: Dict[str, Channel] = {}
+        self.pumps: Dict[str, asyncio.Task] = {}
+        self.stats = {"sent": 0, "coalesced": 0, "dropped": 0}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Hub counters for monitoring"""
+        return {
+            "generations": len(self.channels),
+            "clients": sum(len(channel.clients) for channel in self.channels.values()),
+            **self.stats,
+        }
+
+    async def attach(self, generation_id: str, websocket):
+        """
+        Serve one accepted WebSocket until it disconnects
+
+        The client receives the current status immediately, then every
+        subsequent update (coalesced if it falls behind).
+        """
+        client = HubClient(websocket, self.queue_size)
+        channel = self.channels.setdefault(generation_id, Channel())
+        channel.clients.add(client)
+        if channel.latest:
+            client.offer(channel.latest)
+        if generation_id not in self.pumps:
+            self.pumps[generation_id] = asyncio.create_task(self._pump(generation_id, channel))
+
+        sender = asyncio.create_task(client.send_loop(self.send_timeout, self.stats))
+        receiver = asyncio.create_task(client.receive_loop())
+        try:
+            done, _ = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            # Retrieve exceptions; only a failed send counts as a dropped client
+            errors = {task: task.exception() for task in done}
+            if errors.get(sender):
+                self.stats["dropped"] += 1
+                logger.info(f"Dropped WebSocket client of {generation_id}: {errors[sender]!r}")
+        finally:
+            sender.cancel()
+            receiver.cancel()
+            self.stats["coalesced"] += client.coalesced
+            channel.clients.discard(client)
+            if not channel.clients:
+                self.channels.pop(generation_id, None)
+                pump = self.pumps.pop(generation_id, None)
+                if pump:
+                    pump.cancel()
+            await self.store.touch(generation_id)
+
+    async def _pump(self, generation_id: str, channel: Channel):
+        """Relay one generation's updates to its local clients"""
+        try:
+            async with self.store.subscribe(generation_id) as updates:
+                # Snapshot after subscribing, so no update falls in between
+                current = await self.store.get(generation_id)
+                if current:
+                    channel.publish(current)
+                touched = float("-inf")
+                while channel.clients:
+                    # Mark the generation watched once per touch_interval, not once per update
+                    now = time.monotonic()
+                    if now - touched >= self.touch_interval:
+                        await self.store.touch(generation_id)
+                        touched = now
+                    try:
+                        channel.publish(await asyncio.wait_for(
+                            updates.get(), max(0.0, touched + self.touch_interval - now)
+                        ))
+                    except asyncio.TimeoutError:
+                        continue
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Broadcast pump for {generation_id} failed: {str(e)}")
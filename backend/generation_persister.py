@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Write-Behind Generation Persistence for Script-to-Video
+Coalesces generation status updates in memory and flushes them to MongoDB
+in bulk, so progress survives a crash without one write per tick
+"""
+import asyncio
+import logging
+from typing import Dict, Any, Optional
+
+from pymongo import UpdateOne
+
+from status_store import TERMINAL_STATUSES
+
+logger = logging.getLogger(__name__)
+
+
+class GenerationPersister:
+    """
+    Write-behind persister for the generations collection
+
+    record() merges fields into a pending $set per generation. A background
+    task writes all pending generations with one unordered bulk_write every
+    interval seconds. A terminal status (completed/failed) is flushed
+    immediately. Failed flushes are merged back under any newer fields and
+    retried on the next interval.
+    """
+
+    def __init__(self, collection, interval: float = 2.0):
+        """
+        Initialize generation persister
+
+        Args:
+            collection: Motor collection holding generation records
+            interval: Seconds between background flushes
+        """
+        self.collection = collection
+        self.interval = interval
+        self.pending: Dict[str, Dict[str, Any]] = {}
+        self.stats = {"recorded": 0, "flushes": 0, "writes": 0, "errors": 0}
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Start the background flush loop"""
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        """Stop the flush loop and write whatever is pending"""
+        if self._task:
+            self._task.cancel()
+        await self.flush()
+
+    async def record(self, generation_id: str, fields: Dict[str, Any]):
+        """Queue fields for a generation; terminal statuses are written before returning"""
+        self.pending.setdefault(generation_id, {}).update(fields)
+        self.stats["recorded"] += 1
+        if fields.get("status") in TERMINAL_STATUSES:
+            await self.flush()
+
+    async def flush(self):
+        """Write all pending updates with one bulk_write"""
+        async with self._lock:
+            if not self.pending:
+                return
+            batch, self.pending = self.pending, {}
+            try:
+                await self.collection.bulk_write(
+                    [UpdateOne({"generation_id": generation_id}, {"$set": fields})
+                     for generation_id, fields in batch.items()],
+                    ordered=False
+                )
+                self.stats["flushes"] += 1
+                self.stats["writes"] += len(batch)
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"Generation flush failed for {len(batch)} generations: {str(e)}")
+                for generation_id, fields in batch.items():
+                    self.pending[generation_id] = {**fields, **self.pending.get(generation_id, {})}
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Generation Scheduler for Script-to-Video
+Runs queued generations on a fixed pool of workers, interactive work first and
+cheapest first, with aging so large and batch jobs still make progress, and
+shares workers and scene-render slots fairly between tenants
+"""
+import time
+import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Deque, AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_CLASSES = ("interactive", "batch")
+
+
+@dataclass
+class QueuedJob:
+    job_id: str
+    payload: Dict[str, Any]
+    priority: str
+    cost: float
+    tenant: str = "default"
+    enqueued_at: float = 0.0
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of values (0 when empty)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, round(fraction * len(ordered)) - 1))]
+
+
+class FairShare:
+    """
+    Weighted fair share accounting between tenants
+
+    Each tenant's virtual time is the work it has been given divided by its
+    weight; the backlogged tenant with the lowest virtual time is served next.
+    A tenant that becomes backlogged again starts at the lowest virtual time
+    among backlogged tenants, so idle periods do not build up credit.
+    """
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None, default_weight: float = 1.0):
+        """
+        Initialize fair share accounting
+
+        Args:
+            weights: Weight per tenant (a tenant with weight 2 gets twice the share)
+            default_weight: Weight of tenants not listed
+        """
+        self.weights = weights or {}
+        self.default_weight = default_weight
+        self.virtual: Dict[str, float] = {}
+        self.served: Dict[str, float] = {}
+
+    def weight(self, tenant: str) -> float:
+        return self.weights.get(tenant, self.default_weight)
+
+    def activate(self, tenant: str, backlogged: List[str]):
+        """Bring a tenant that had nothing waiting up to the backlogged tenants' virtual time"""
+        floor = min((self.virtual.get(other, 0.0) for other in backlogged if other != tenant), default=None)
+        if floor is not None:
+            self.virtual[tenant] = max(self.virtual.get(tenant, 0.0), floor)
+        else:
+            self.virtual.setdefault(tenant, 0.0)
+
+    def charge(self, tenant: str, amount: float):
+        """Account work given to a tenant"""
+        self.virtual[tenant] = self.virtual.get(tenant, 0.0) + amount / self.weight(tenant)
+        self.served[tenant] = self.served.get(tenant, 0.0) + amount
+
+
+class RenderSlots:
+    """
+    Pool of scene-render slots shared fairly between tenants
+
+    Generations run more jobs than there are slots (script analysis, voice-over
+    and uploads overlap rendering), so the slots are the real limit on model
+    work. A freed slot goes to an interactive waiter before a batch one, then
+    to the waiting tenant with the lowest virtual time (ties go to the tenant
+    holding fewer slots), so a tenant with many running generations cannot
+    keep every slot.
+    """
+
+    def __init__(self, capacity: int, fair_share: FairShare):
+        """
+        Initialize render slot pool
+
+        Args:
+            capacity: Scene renders running at once
+            fair_share: Accounting used to pick the next tenant
+        """
+        self.capacity = capacity
+        self.fair_share = fair_share
+        self.in_use = 0
+        self.held: Dict[str, int] = {}
+        self.waiting: Dict[tuple, Deque[asyncio.Future]] = {}
+        self.waits: Dict[str, Deque[float]] = {}
+
+    def _waiting_tenants(self) -> List[str]:
+        return list({tenant for _, tenant in self.waiting})
+
+    @asynccontextmanager
+    async def slot(self, tenant: str, cost: float = 1.0, priority: str = "interactive") -> AsyncIterator[None]:
+        """Hold one render slot, charged to tenant"""
+        started = time.monotonic()
+        if self.in_use < self.capacity and not self.waiting:
+            self.in_use += 1
+        else:
+            waiting_tenants = self._waiting_tenants()
+            if tenant not in waiting_tenants:
+                self.fair_share.activate(tenant, waiting_tenants)
+            key = (PRIORITY_CLASSES.index(priority), tenant)
+            future = asyncio.get_running_loop().create_future()
+            self.waiting.setdefault(key, deque()).append(future)
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # Granted and cancelled in the same step: pass the slot on
+                    self._release()
+                else:
+                    self._discard(key, future)
+                raise
+        self.held[tenant] = self.held.get(tenant, 0) + 1
+        self.waits.setdefault(tenant, deque(maxlen=1000)).append(time.monotonic() - started)
+        self.fair_share.charge(tenant, cost)
+        try:
+            yield
+        finally:
+            self.held[tenant] -= 1
+            if not self.held[tenant]:
+                del self.held[tenant]
+            self._release()
+
+    def _discard(self, key: tuple, future: asyncio.Future):
+        queue = self.waiting.get(key)
+        if queue and future in queue:
+            queue.remove(future)
+            if not queue:
+                del self.waiting[key]
+
+    def _release(self):
+        """Hand the freed slot to the next live waiter in fair order, or return it to the pool"""
+        while self.waiting:
+            key = min(self.waiting, key=lambda waiting: (
+                waiting[0], self.fair_share.virtual.get(waiting[1], 0.0), self.held.get(waiting[1], 0)
+            ))
+            future = self.waiting[key].popleft()
+            if not self.waiting[key]:
+                del self.waiting[key]
+            # A waiter cancelled before its handler ran is skipped, not handed the slot
+            if not future.done():
+                future.set_result(None)
+                return
+        self.in_use -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Slot usage and per-tenant render waits"""
+        waiting: Dict[str, int] = {}
+        for (_, tenant), queue in self.waiting.items():
+            waiting[tenant] = waiting.get(tenant, 0) + len(queue)
+        return {
+            "capacity": self.capacity,
+            "in_use": self.in_use,
+            "tenants": {
+                tenant: {
+                    "holding": self.held.get(tenant, 0),
+                    "waiting": waiting.get(tenant, 0),
+                    "wait_mean_seconds": round(sum(waits) / len(waits), 2) if waits else 0.0,
+                    "wait_p95_seconds": round(percentile(list(waits), 0.95), 2),
+                }
+                for tenant, waits in self.waits.items()
+            },
+        }
+
+
+class GenerationScheduler:
+    """
+    Priority, shortest-job-first scheduler with aging
+
+    The next job is the one with the lowest (class, aged cost, arrival) key:
+    interactive jobs go before batch jobs, then smaller estimated cost first.
+    Waiting lowers a job's cost by aging_rate worker-seconds per second, and
+    a batch job that has waited promote_after seconds competes as interactive,
+    so no job waits forever behind a stream of smaller ones. Jobs are not
+    preempted, so at most batch_slots unpromoted batch jobs run at once and
+    the remaining workers stay free for interactive work. Within a class,
+    tenants are served by weighted fair queuing on estimated cost, and no
+    tenant runs more than tenant_workers jobs, so another tenant's job can
+    always start and compete for render slots.
+    """
+
+    def __init__(self, run: Callable[[str, Dict[str, Any]], Awaitable[None]], workers: int = 1,
+                 aging_rate: float = 0.25, promote_after: float = 1800.0, batch_slots: Optional[int] = None,
+                 tenant_workers: Optional[int] = None, fair_share: Optional[FairShare] = None,
+                 clock: Callable[[], float] = time.monotonic, history: int = 1000):
+        """
+        Initialize generation scheduler
+
+        Args:
+            run: Coroutine function run(job_id, payload) executing one job
+            workers: Jobs run concurrently
+            aging_rate: Worker-seconds of estimated cost forgiven per second waited
+            promote_after: Seconds after which a batch job is scheduled as interactive
+            batch_slots: Most unpromoted batch jobs running at once (default: all but one worker)
+            tenant_workers: Most jobs of one tenant running at once (default: all but one worker)
+            fair_share: Tenant weights and accounting (default: equal weights)
+            clock: Time source (monotonic seconds)
+            history: Recent queue waits kept per class and tenant for latency statistics
+        """
+        self.run = run
+        self.workers = workers
+        self.aging_rate = aging_rate
+        self.promote_after = promote_after
+        self.batch_slots = batch_slots if batch_slots is not None else max(1, workers - 1)
+        self.tenant_workers = tenant_workers if tenant_workers is not None else max(1, workers - 1)
+        self.fair_share = fair_share or FairShare()
+        self.clock = clock
+        self.history = history
+        self.queue: List[QueuedJob] = []
+        self.running: Dict[str, QueuedJob] = {}
+        self.waits: Dict[str, Deque[float]] = {name: deque(maxlen=history) for name in PRIORITY_CLASSES}
+        self.tenant_waits: Dict[str, Deque[float]] = {}
+        self.stats = {"submitted": 0, "dispatched": 0, "promoted": 0, "failed": 0}
+        self._ready = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    def push(self, job: QueuedJob):
+        """Queue a job, stamping its arrival time"""
+        if job.priority not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown priority class '{job.priority}'")
+        job.enqueued_at = self.clock()
+        backlogged = {queued.tenant for queued in self.queue}
+        if job.tenant not in backlogged:
+            self.fair_share.activate(job.tenant, list(backlogged))
+        self.queue.append(job)
+        self.stats["submitted"] += 1
+        self._ready.set()
+
+    def _promoted(self, job: QueuedJob, now: float) -> bool:
+        return job.priority == "interactive" or now - job.enqueued_at >= self.promote_after
+
+    def _key(self, job: QueuedJob, now: float) -> tuple:
+        rank = 0 if self._promoted(job, now) else PRIORITY_CLASSES.index(job.priority)
+        return (rank, self.fair_share.virtual.get(job.tenant, 0.0),
+                job.cost - self.aging_rate * (now - job.enqueued_at), job.enqueued_at)
+
+    def pop(self) -> Optional[QueuedJob]:
+        """Remove and return the job that should run next (None if nothing may run now)"""
+        now = self.clock()
+        running_batch = sum(1 for job in self.running.values() if job.priority == "batch")
+        running_tenants: Dict[str, int] = {}
+        for job in self.running.values():
+            running_tenants[job.tenant] = running_tenants.get(job.tenant, 0) + 1
+        candidates = [
+            job for job in self.queue
+            if running_tenants.get(job.tenant, 0) < self.tenant_workers
+            and (running_batch < self.batch_slots or self._promoted(job, now))
+        ]
+        if not candidates:
+            return None
+        job = min(candidates, key=lambda queued: self._key(queued, now))
+        self.queue.remove(job)
+        waited = now - job.enqueued_at
+        if job.priority != "interactive" and waited >= self.promote_after:
+            self.stats["promoted"] += 1
+        self.waits[job.priority].append(waited)
+        self.tenant_waits.setdefault(job.tenant, deque(maxlen=self.history)).append(waited)
+        self.fair_share.charge(job.tenant, job.cost)
+        self.stats["dispatched"] += 1
+        return job
+
+    async def submit(self, job_id: str, payload: Dict[str, Any], priority: str = "interactive",
+                     cost: float = 0.0, tenant: str = "default"):
+        """Queue a job for the worker pool"""
+        self.push(QueuedJob(job_id, payload, priority, cost, tenant))
+
+    async def start(self):
+        """Start the worker tasks"""
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def close(self):
+        """Stop the workers; queued jobs are not run"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self.queue:
+            logger.warning(f"Generation scheduler stopped with {len(self.queue)} queued jobs")
+
+    async def _worker(self):
+        while True:
+            job = self.pop()
+            if job is None:
+                # Woken by a new job or a finished one (which may free a batch or tenant slot);
+                # a batch job waiting only for promotion is picked up on the next wake-up
+                self._ready.clear()
+                try:
+                    await asyncio.wait_for(self._ready.wait(), self.promote_after)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self.running[job.job_id] = job
+            try:
+                await self.run(job.job_id, job.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["failed"] += 1
+                logger.error(f"Scheduled job {job.job_id} failed: {str(e)}")
+            finally:
+                self.running.pop(job.job_id, None)
+                self._ready.set()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Queue depth and recent queue-wait statistics per priority class and tenant"""
+        classes = {}
+        for name in PRIORITY_CLASSES:
+            waits = list(self.waits[name])
+            classes[name] = {
+                "queued": sum(1 for job in self.queue if job.priority == name),
+                "running": sum(1 for job in self.running.values() if job.priority == name),
+                "wait_mean_seconds": round(sum(waits) / len(waits), 2) if waits else 0.0,
+                "wait_p95_seconds": round(percentile(waits, 0.95), 2),
+            }
+        tenants = {}
+        for tenant in {job.tenant for job in self.queue} | set(self.tenant_waits):
+            waits = list(self.tenant_waits.get(tenant, ()))
+            tenants[tenant] = {
+                "weight": self.fair_share.weight(tenant),
+                "queued": sum(1 for job in self.queue if job.tenant == tenant),
+                "queued_cost": round(sum(job.cost for job in self.queue if job.tenant == tenant), 1),
+                "running": sum(1 for job in self.running.values() if job.tenant == tenant),
+                "served_cost": round(self.fair_share.served.get(tenant, 0.0), 1),
+                "wait_mean_seconds": round(sum(waits) / len(waits), 2) if waits else 0.0,
+                "wait_p95_seconds": round(percentile(waits, 0.95), 2),
+            }
+        return {"workers": self.workers, "classes": classes, "tenants": tenants, **self.stats}
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Keyset Pagination for Script-to-Video
+Opaque cursors over (created_at, id) so listing pages stay stable under
+inserts and cost the same at any depth
+"""
+import json
+import base64
+from datetime import datetime
+from typing import Dict, Optional
+
+# pymongo.DESCENDING, spelled out so the module does not need the driver
+DESCENDING = -1
+
+
+class InvalidCursor(ValueError):
+    """A cursor that was not produced by encode_cursor"""
+
+
+def encode_cursor(created_at: datetime, item_id: str) -> str:
+    """Opaque keyset cursor pointing after (created_at, id)"""
+    payload = json.dumps({"t": created_at.isoformat(), "id": item_id})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """(created_at, id) from a cursor; InvalidCursor if it is malformed"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(payload["t"]), payload["id"]
+    except Exception:
+        raise InvalidCursor("Invalid cursor")
+
+
+async def keyset_page(collection, query: Dict, id_field: str, projection: Dict,
+                      limit: int, cursor: Optional[str]) -> Dict:
+    """
+    One page of a collection ordered newest first by (created_at, id_field)
+
+    The cursor resumes strictly after the last item of the previous page.
+
+    Returns:
+        Dict with items and next_cursor (None on the last page)
+    """
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        query = {**query, "$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, id_field: {"$lt": last_id}},
+        ]}
+
+    items = await collection.find(query, projection).sort(
+        [("created_at", DESCENDING), (id_field, DESCENDING)]
+    ).limit(limit + 1).to_list(length=limit + 1)
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1]["created_at"], items[-1][id_field])
+    return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+MongoDB Query Instrumentation for Script-to-Video
+Command timings collected through PyMongo command monitoring
+"""
+import time
+import logging
+import threading
+from typing import Dict, Any
+
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+# Commands worth timing (handshakes, pings and cursor cleanup are skipped)
+TIMED_COMMANDS = {
+    "find", "insert", "update", "delete", "findAndModify", "aggregate",
+    "count", "distinct", "getMore", "createIndexes", "bulkWrite",
+}
+
+
+class QueryMetrics(monitoring.CommandListener):
+    """
+    Per collection and command timing statistics
+
+    Register with AsyncIOMotorClient(event_listeners=[metrics]). Commands
+    slower than slow_ms are logged with their filter shape.
+    """
+
+    def __init__(self, slow_ms: float = 100.0):
+        """
+        Initialize query metrics
+
+        Args:
+            slow_ms: Duration above which a command is logged and counted as slow
+        """
+        self.slow_ms = slow_ms
+        self.since = time.time()
+        self._pending: Dict[int, tuple] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        if event.command_name in TIMED_COMMANDS:
+            collection = event.command.get(event.command_name)
+            query = event.command.get("filter") or event.command.get("q")
+            self._pending[event.request_id] = (collection, query)
+
+    def succeeded(self, event):
+        self._record(event, failed=False)
+
+    def failed(self, event):
+        self._record(event, failed=True)
+
+    def _record(self, event, failed: bool):
+        collection, query = self._pending.pop(event.request_id, (None, None))
+        if event.command_name not in TIMED_COMMANDS:
+            return
+
+        duration_ms = event.duration_micros / 1000
+        key = f"{collection}.{event.command_name}" if isinstance(collection, str) else event.command_name
+        with self._lock:
+            stats = self._stats.setdefault(key, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "slow": 0, "failed": 0})
+            stats["count"] += 1
+            stats["total_ms"] += duration_ms
+            stats["max_ms"] = max(stats["max_ms"], duration_ms)
+            stats["failed"] += int(failed)
+            if duration_ms > self.slow_ms:
+                stats["slow"] += 1
+
+        if duration_ms > self.slow_ms:
+            fields = sorted(query) if isinstance(query, dict) else None
+            logger.warning(f"Slow MongoDB {key}: {duration_ms:.1f}ms filter fields={fields}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Timing statistics per collection.command"""
+        with self._lock:
+            commands = {
+                key: {**stats, "avg_ms": round(stats["total_ms"] / stats["count"], 3)}
+                for key, stats in self._stats.items()
+            }
+        return {
+            "slow_ms": self.slow_ms,
+            "since": self.since,
+            "commands": commands,
+        }
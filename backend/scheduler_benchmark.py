@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Generation Scheduler Benchmark
+Simulates a mixed workload of short interactive generations and long batch
+generations, and compares arrival-order dispatch with GenerationScheduler
+
+Usage:
+    python scheduler_benchmark.py --workers 2 --jobs 2000 --load 0.85
+"""
+import random
+import argparse
+import statistics
+
+from generation_scheduler import GenerationScheduler, QueuedJob, percentile
+
+
+class SimulatedClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def workload(jobs: int, workers: int, load: float, batch_fraction: float, seed: int):
+    """Poisson arrivals of (arrival, priority, cost) at the given utilization"""
+    rng = random.Random(seed)
+    costs = []
+    for _ in range(jobs):
+        if rng.random() < batch_fraction:
+            costs.append(("batch", rng.uniform(600, 1800)))  # 20-30 scene scripts
+        else:
+            costs.append(("interactive", rng.uniform(30, 120)))  # 2-3 scene previews
+    mean_cost = sum(cost for _, cost in costs) / jobs
+    rate = load * workers / mean_cost
+    arrival = 0.0
+    for priority, cost in costs:
+        arrival += rng.expovariate(rate)
+        yield arrival, priority, cost
+
+
+def simulate(arrivals, workers: int, fifo: bool, aging_rate: float, promote_after: float):
+    """Latency (queue wait + run time) per priority class, by discrete-event simulation"""
+    clock = SimulatedClock()
+    # Single-tenant workload: every worker is available to the one tenant
+    scheduler = GenerationScheduler(None, workers, aging_rate, promote_after, tenant_workers=workers, clock=clock)
+    if fifo:
+        scheduler.batch_slots = workers
+        scheduler._key = lambda job, now: job.enqueued_at
+    finishing = {}
+    latencies = {"interactive": [], "batch": []}
+    index = 0
+    while index < len(arrivals) or scheduler.queue or finishing:
+        # Next event: an arrival, a job finishing, or a queued batch job being promoted
+        events = list(finishing.values())
+        if index < len(arrivals):
+            events.append(arrivals[index][0])
+        events += [job.enqueued_at + promote_after for job in scheduler.queue if job.enqueued_at + promote_after > clock.now]
+        clock.now = min(events)
+
+        for job_id, finished_at in list(finishing.items()):
+            if finished_at <= clock.now:
+                job = scheduler.running.pop(job_id)
+                latencies[job.priority].append(finished_at - job.enqueued_at)
+                del finishing[job_id]
+        while index < len(arrivals) and arrivals[index][0] <= clock.now:
+            scheduler.push(QueuedJob(str(index), {}, arrivals[index][1], arrivals[index][2]))
+            index += 1
+        while len(scheduler.running) < workers:
+            job = scheduler.pop()
+            if job is None:
+                break
+            scheduler.running[job.job_id] = job
+            finishing[job.job_id] = clock.now + job.cost
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark generation scheduling policies")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--load", type=float, default=0.85, help="Offered load as a fraction of worker capacity")
+    parser.add_argument("--batch-fraction", type=float, default=0.1)
+    parser.add_argument("--aging-rate", type=float, default=0.25)
+    parser.add_argument("--promote-after", type=float, default=1800.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    arrivals = list(workload(args.jobs, args.workers, args.load, args.batch_fraction, args.seed))
+    for name, fifo in (("arrival order", True), ("scheduler", False)):
+        latencies = simulate(arrivals, args.workers, fifo, args.aging_rate, args.promote_after)
+        print(name)
+        for priority, values in latencies.items():
+            if values:
+                print(f"  {priority:<12} jobs={len(values):<5} mean={statistics.mean(values):8.1f}s "
+                      f"p95={percentile(values, 0.95):8.1f}s max={max(values):8.1f}s")
+
+
+if __name__ == "__main__":
+    main()
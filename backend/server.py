@@ -11,21 +11,30 @@ import asyncio
 import logging
 import tempfile
 import uuid
+import time
+import copy
+import hashlib
+import hmac
+import math
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Literal
 from pathlib import Path
 import base64
 import io
 
 # FastAPI imports
-from fastapi import FastAPI, HTTPException, BackgroundTasks, WebSocket, WebSocketDisconnect, File, UploadFile, Form
+from fastapi import FastAPI, HTTPException, WebSocket, File, UploadFile, Form, Request, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, StreamingResponse
-from pydantic import BaseModel, Field
+from fastapi import Query, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, StreamingResponse, JSONResponse
+from pydantic import BaseModel, Field, ValidationError
 
 # Database imports
 from motor.motor_asyncio import AsyncIOMotorClient
 import pymongo
+from pymongo.errors import BulkWriteError
 
 # AI and processing imports
 import torch
@@ -46,6 +55,19 @@ from emergentintegrations.llm.chat import LlmChat, UserMessage
 # Add the project root to path
 sys.path.append('/app')
 from ai_models import ai_manager
+from video_processing import (
+    encode_frames, reframe_frames, decode_clip_frames,
+    select_poster_frame, thumbnail_strip, fit_image, encode_image, decode_image, IMAGE_FORMATS
+)
+from audio_processing import decode_audio, encode_wav
+from audio_mixer import AudioMixer, to_pcm_bytes
+from status_store import StatusStore, LocalStatusStore, create_status_store, TERMINAL_STATUSES
+from broadcast_hub import BroadcastHub
+from query_metrics import QueryMetrics
+from generation_persister import GenerationPersister
+from pagination import InvalidCursor, keyset_page
+from admission import AdmissionController, estimate_job_cost
+from generation_scheduler import GenerationScheduler, FairShare, RenderSlots
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -70,6 +92,7 @@ app.add_middleware(
 # Database setup
 mongodb_client = None
 db = None
+query_metrics = QueryMetrics(slow_ms=float(os.getenv("SLOW_QUERY_MS", "100")))
 
 # Environment variables
 MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017")
@@ -94,10 +117,81 @@ r2_client = boto3.client(
     config=Config(signature_version='s3v4'),
 )
 
+# Most items accepted by the batch endpoints, ids by bulk status and items per listing page
+MAX_BATCH_SIZE = 500
+MAX_BULK_STATUS_IDS = 1000
+MAX_PAGE_SIZE = 200
+
+# Aspect ratios that can be derived from a master render
+OUTPUT_ASPECT_RATIOS = ("16:9", "9:16", "1:1", "4:5")
+
+# Preview images captured from rendered frames
+PREVIEW_FORMAT = "webp"
+POSTER_MAX_WIDTH = 1280
+THUMBNAIL_HEIGHT = 90
+
+# Progressive mode: draft render settings, and how long an unwatched draft waits before final rendering stops
+DRAFT_RENDER = {"render_scale": 0.25, "render_fps": 8, "num_inference_steps": 10}
+DRAFT_ABANDON_SECONDS = 120
+
+# Compress WebSocket status messages (permessage-deflate)
+WS_PER_MESSAGE_DEFLATE = os.getenv("WS_PER_MESSAGE_DEFLATE", "true").lower() == "true"
+
+# Server-Sent Events: heartbeat interval and client reconnect delay
+SSE_HEARTBEAT_SECONDS = 15.0
+SSE_RETRY_MS = 3000
+
+# Status polling: longest long-poll hold and number of finished generations cached in process
+MAX_STATUS_WAIT_SECONDS = 60.0
+TERMINAL_CACHE_SIZE = 10000
+
+# Seconds between write-behind flushes of generation progress to MongoDB
+PERSIST_INTERVAL_SECONDS = float(os.getenv("PERSIST_INTERVAL_SECONDS", "2.0"))
+
+# Generation capacity: jobs in progress at once, and scene renders (model work) at once. Jobs
+# outnumber render slots so script analysis, voice-over and uploads overlap rendering
+GENERATION_WORKERS = int(os.getenv("GENERATION_WORKERS", "4"))
+RENDER_SLOTS = int(os.getenv("RENDER_SLOTS", "1"))
+
+# Voice-over: ElevenLabs requests in flight at once across all jobs, and attempts per scene
+TTS_CONCURRENCY = int(os.getenv("TTS_CONCURRENCY", "4"))
+TTS_ATTEMPTS = 3
+
+# Admission control: longest backlog a new job may join (seconds of render-slot time),
+# and each client's worker-seconds earned per second and spendable at once
+ADMISSION_MAX_WAIT_SECONDS = float(os.getenv("ADMISSION_MAX_WAIT_SECONDS", "3600"))
+CLIENT_COST_RATE = float(os.getenv("CLIENT_COST_RATE", "0.5"))
+CLIENT_COST_BURST = float(os.getenv("CLIENT_COST_BURST", "1800"))
+
+# API keys (comma separated) recognized as client and tenant identities; other callers are
+# identified by address, so an invented X-API-Key header cannot buy a fresh budget
+CLIENT_API_KEYS = {key.strip() for key in os.getenv("CLIENT_API_KEYS", "").split(",") if key.strip()}
+
+# Scheduling: worker-seconds of estimated cost forgiven per second queued, and seconds
+# after which a batch generation is scheduled like an interactive one
+SCHEDULER_AGING_RATE = float(os.getenv("SCHEDULER_AGING_RATE", "0.25"))
+BATCH_PROMOTE_SECONDS = float(os.getenv("BATCH_PROMOTE_SECONDS", "1800"))
+
+# Tenant fairness: tenant weights for generation workers and render slots, as a JSON object
+# keyed by tenant id (as shown by /api/metrics/scheduler), e.g. {"key:3f2a...": 2}
+TENANT_WEIGHTS = json.loads(os.getenv("TENANT_WEIGHTS", "{}"))
+
+# Status reads leave out the scene plan (it embeds the script and its analysis)
+STATUS_PROJECTION = {"_id": 0, "plan": 0}
+
 # Global variables
 current_gemini_key_index = 0
-active_connections: Dict[str, WebSocket] = {}
-generation_status: Dict[str, Dict] = {}
+status_store: StatusStore = LocalStatusStore()
+broadcast_hub = BroadcastHub(status_store)
+terminal_status_cache: "OrderedDict[str, tuple]" = OrderedDict()
+generation_persister: Optional[GenerationPersister] = None
+generation_scheduler: Optional[GenerationScheduler] = None
+render_slots = RenderSlots(RENDER_SLOTS, FairShare(TENANT_WEIGHTS))
+tts_slots = asyncio.Semaphore(TTS_CONCURRENCY)
+admission = AdmissionController(
+    workers=RENDER_SLOTS, max_wait=ADMISSION_MAX_WAIT_SECONDS,
+    client_rate=CLIENT_COST_RATE, client_burst=CLIENT_COST_BURST
+)
 
 # --- Pydantic Models ---
 
@@ -117,12 +211,38 @@ class GenerationRequest(BaseModel):
     script: str
     aspect_ratio: str = "16:9"
     voice_id: Optional[str] = None
+    render_fps: Optional[int] = Field(None, ge=8, le=24, description="Render at this frame rate and interpolate up to 24 fps")
+    render_scale: float = Field(1.0, ge=0.25, le=1.0, description="Render at this fraction of the output resolution and upscale")
+    output_aspect_ratios: List[str] = Field(default_factory=list, description="Extra outputs derived from the master render")
+    progressive: bool = Field(False, description="Publish a quick draft first, then swap in final-quality scenes")
+    priority: Optional[Literal["interactive", "batch"]] = Field(
+        None, description="Scheduling class (default: interactive, or batch from the batch endpoint)"
+    )
 
 class GenerationResponse(BaseModel):
     generation_id: str
     status: str
     progress: float = 0.0
     message: str = ""
+    estimated_cost: Optional[float] = None
+    eta_seconds: Optional[float] = None
+
+class BatchRequest(BaseModel):
+    items: List[Dict[str, Any]] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+class BulkStatusRequest(BaseModel):
+    generation_ids: List[str] = Field(..., min_length=1, max_length=MAX_BULK_STATUS_IDS)
+
+class BatchItemResult(BaseModel):
+    index: int
+    id: Optional[str] = None
+    status: Optional[str] = None
+    error: Optional[str] = None
+
+class BatchResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BatchItemResult]
 
 class VoiceResponse(BaseModel):
     voice_id: str
@@ -135,17 +255,43 @@ async def connect_to_mongo():
     """Connect to MongoDB"""
     global mongodb_client, db
     try:
-        mongodb_client = AsyncIOMotorClient(MONGO_URL)
+        mongodb_client = AsyncIOMotorClient(MONGO_URL, event_listeners=[query_metrics])
         db = mongodb_client.script_to_video
         
         # Test the connection
         await db.command("ping")
         logger.info("Connected to MongoDB successfully")
+        
+        await ensure_indexes()
         return True
     except Exception as e:
         logger.error(f"Failed to connect to MongoDB: {str(e)}")
         return False
 
+async def ensure_indexes():
+    """Create the indexes the API queries rely on (no-op when they already exist)"""
+    await asyncio.gather(
+        db.projects.create_indexes([
+            pymongo.IndexModel("project_id", unique=True),
+            pymongo.IndexModel([("created_at", pymongo.DESCENDING), ("project_id", pymongo.DESCENDING)]),
+        ]),
+        db.generations.create_indexes([
+            pymongo.IndexModel("generation_id", unique=True),
+            pymongo.IndexModel([
+                ("project_id", pymongo.ASCENDING),
+                ("created_at", pymongo.DESCENDING),
+                ("generation_id", pymongo.DESCENDING),
+            ]),
+            pymongo.IndexModel([
+                ("project_id", pymongo.ASCENDING),
+                ("status", pymongo.ASCENDING),
+                ("created_at", pymongo.DESCENDING),
+            ]),
+            pymongo.IndexModel([("status", pymongo.ASCENDING), ("created_at", pymongo.ASCENDING)]),
+        ]),
+    )
+    logger.info("MongoDB indexes ensured")
+
 async def close_mongo_connection():
     """Close MongoDB connection"""
     global mongodb_client
@@ -189,6 +335,7 @@ class GeminiManager:
                - description: string (visual description for video generation)
                - duration: int (seconds)
                - audio_text: string (text to be spoken)
+               - sound_effects: string (short description of background sound effects)
             2. total_duration: int (total video duration in seconds)
             3. theme: string (overall theme/mood)
             
@@ -337,6 +484,10 @@ class ElevenLabsManager:
 
 # --- Storage Functions ---
 
+def r2_url(file_name: str) -> str:
+    """Public URL of an R2 object"""
+    return f"{R2_ENDPOINT}/script-to-video/{file_name}"
+
 async def upload_to_r2(file_content: bytes, file_name: str, content_type: str) -> str:
     """Upload file to Cloudflare R2"""
     try:
@@ -346,15 +497,29 @@ async def upload_to_r2(file_content: bytes, file_name: str, content_type: str) -
             Body=file_content,
             ContentType=content_type
         )
-        return f"{R2_ENDPOINT}/script-to-video/{file_name}"
+        return r2_url(file_name)
     except Exception as e:
         logger.error(f"R2 upload failed: {str(e)}")
         return None
 
+async def download_from_r2(file_name: str) -> Optional[bytes]:
+    """Download file from Cloudflare R2"""
+    try:
+        response = await asyncio.to_thread(
+            r2_client.get_object, Bucket="script-to-video", Key=file_name
+        )
+        return await asyncio.to_thread(response["Body"].read)
+    except Exception as e:
+        logger.error(f"R2 download failed: {str(e)}")
+        return None
+
 # --- Video Processing ---
 
-async def combine_video_clips(video_clips: List[str], audio_file: str, output_path: str) -> bool:
-    """Combine video clips with audio using FFmpeg"""
+SFX_GAIN_DB = -9.0
+
+async def combine_video_clips(video_clips: List[str], audio_pcm: np.ndarray, output_path: str,
+                              sample_rate: int) -> bool:
+    """Combine video clips with the mixed soundtrack, piped to FFmpeg as raw PCM"""
     try:
         # Create a temporary file list for FFmpeg
         with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
@@ -362,15 +527,18 @@ async def combine_video_clips(video_clips: List[str], audio_file: str, output_pa
                 f.write(f"file '{clip}'\n")
             list_file = f.name
         
-        # FFmpeg command to concatenate videos and add audio
+        # FFmpeg command to concatenate videos and add the soundtrack from stdin
         cmd = [
             'ffmpeg', '-f', 'concat', '-safe', '0', '-i', list_file,
-            '-i', audio_file,
+            '-f', 'f32le', '-ar', str(sample_rate), '-ac', str(audio_pcm.shape[0]), '-i', 'pipe:0',
+            '-map', '0:v', '-map', '1:a',
             '-c:v', 'libx264', '-c:a', 'aac',
             '-shortest', '-y', output_path
         ]
         
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = await asyncio.to_thread(
+            subprocess.run, cmd, input=to_pcm_bytes(audio_pcm), capture_output=True
+        )
         
         # Clean up temp file
         os.unlink(list_file)
@@ -379,7 +547,7 @@ async def combine_video_clips(video_clips: List[str], audio_file: str, output_pa
             logger.info("Video combination successful")
             return True
         else:
-            logger.error(f"FFmpeg error: {result.stderr}")
+            logger.error(f"FFmpeg error: {result.stderr.decode(errors='replace')}")
             return False
             
     except Exception as e:
@@ -388,158 +556,587 @@ async def combine_video_clips(video_clips: List[str], audio_file: str, output_pa
 
 # --- Background Tasks ---
 
+async def generate_scene_sfx(scene: Dict, tenant: str, priority: str) -> Optional[np.ndarray]:
+    """Generate a scene's sound effects with Stable Audio Open as float32 audio"""
+    try:
+        prompt = scene.get("sound_effects") or scene["description"]
+        # The audio pipeline is shared and not thread-safe, so it takes a render slot like video does
+        async with render_slots.slot(tenant, scene["duration"], priority):
+            return await asyncio.to_thread(
+                ai_manager.generate_audio_array, prompt, scene["duration"], seed=scene.get("seed")
+            )
+    except Exception as e:
+        logger.error(f"Sound effects generation failed: {str(e)}")
+        return None
+
+SCENE_PADDING = 0.3  # seconds of breathing room after each scene's voice-over
+MIN_SCENE_DURATION = 1.0
+
+async def synthesize_scene_voice(elevenlabs_manager: ElevenLabsManager, scene: Dict,
+                                 voice_id: Optional[str], sample_rate: int) -> Optional[tuple]:
+    """
+    Generate and decode one scene's voice-over; returns (encoded speech, float32 audio)
+    
+    Scenes without narration return None. Failed requests are retried with backoff, and a
+    scene that still has no voice-over raises, so the generation fails instead of going mute.
+    """
+    if not scene.get("audio_text", "").strip():
+        return None
+    for attempt in range(TTS_ATTEMPTS):
+        if attempt:
+            await asyncio.sleep(2 ** attempt)
+        async with tts_slots:
+            speech_audio = await elevenlabs_manager.generate_speech(scene["audio_text"], voice_id)
+        if speech_audio:
+            voice_audio = await asyncio.to_thread(decode_audio, speech_audio, sample_rate)
+            if voice_audio is not None:
+                return speech_audio, voice_audio
+        logger.warning(f"Voice-over attempt {attempt + 1} of {TTS_ATTEMPTS} failed")
+    raise RuntimeError(f"Voice-over generation failed after {TTS_ATTEMPTS} attempts")
+
+def plan_scene_timeline(scenes: List[Dict], voices: List[Optional[np.ndarray]],
+                        sample_rate: int, fps: int) -> float:
+    """
+    Set each scene's num_frames, duration and offset from its measured voice-over
+    
+    Frame counts are whole frames and offsets are their running sum, so the audio
+    timeline lines up with the concatenated clips exactly. Scenes without a
+    voice-over keep the duration from script analysis. Returns the total duration.
+    """
+    total_frames = 0
+    for scene, voice_audio in zip(scenes, voices):
+        if voice_audio is not None:
+            duration = voice_audio.shape[1] / sample_rate + SCENE_PADDING
+        else:
+            duration = float(scene.get("duration") or MIN_SCENE_DURATION)
+        
+        scene["num_frames"] = max(1, int(np.ceil(max(duration, MIN_SCENE_DURATION) * fps)))
+        scene["duration"] = scene["num_frames"] / fps
+        scene["offset"] = total_frames / fps
+        total_frames += scene["num_frames"]
+    
+    return total_frames / fps
+
+# --- Scene Plans ---
+
+# Inputs that change a scene's rendered output; any difference forces a re-render
+SCENE_KEY_FIELDS = ("description", "audio_text", "sound_effects")
+RENDER_KEY_FIELDS = ("aspect_ratio", "voice_id", "render_fps", "render_scale")
+
+def scene_cache_key(scene: Dict, project_data: Dict) -> str:
+    """Content hash identifying a scene's artifacts across generations"""
+    payload = json.dumps({
+        "scene": {field: scene.get(field) for field in SCENE_KEY_FIELDS},
+        "render": {field: project_data.get(field) for field in RENDER_KEY_FIELDS},
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:24]
+
+def scene_artifact_key(project_id: str, scene_key: str, file_name: str) -> str:
+    """R2 object key of a scene artifact"""
+    return f"projects/{project_id}/scenes/{scene_key}/{file_name}"
+
+async def load_previous_plan(project_id: str) -> Optional[Dict]:
+    """Scene plan of the project's most recent completed generation"""
+    generation = await db.generations.find_one(
+        {"project_id": project_id, "status": "completed", "plan": {"$exists": True}},
+        projection={"plan": 1},
+        sort=[("created_at", pymongo.DESCENDING)]
+    )
+    return generation["plan"] if generation else None
+
+def clip_artifact_name(aspect_ratio: Optional[str] = None) -> str:
+    """Artifact name of a scene clip: 'clip' for the master render, 'clip_9x16' etc. for derived outputs"""
+    return f"clip_{aspect_ratio.replace(':', 'x')}" if aspect_ratio else "clip"
+
+def write_temp_clip(data: bytes) -> str:
+    """Write encoded clip bytes to a temporary MP4 file"""
+    with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as f:
+        f.write(data)
+        return f.name
+
+async def load_scene_artifacts(scene: Dict, previous_scene: Dict, sample_rate: int) -> Optional[Dict]:
+    """Download and decode a previous scene's clips, voice-over and sound effects; None if any is missing or undecodable"""
+    artifacts = previous_scene.get("artifacts", {})
+    if "clip" not in artifacts:
+        return None
+    # A narrated scene whose voice-over was never stored must be voiced again, so it is not reusable
+    if scene.get("audio_text", "").strip() and "voice" not in artifacts:
+        return None
+    
+    names = list(artifacts)
+    downloads = await asyncio.gather(*(download_from_r2(artifacts[name]) for name in names))
+    if any(data is None for data in downloads):
+        return None
+    
+    # Decode everything before writing clips, so a failed decode re-renders the scene and leaves no temp files
+    decoded = {}
+    for name, data in zip(names, downloads):
+        if name in ("voice", "sfx"):
+            decoded[name] = await asyncio.to_thread(decode_audio, data, sample_rate)
+        elif name == "poster":
+            decoded[name] = await asyncio.to_thread(decode_image, data)
+        if name in decoded and decoded[name] is None:
+            logger.warning(f"Could not decode reused {name} {artifacts[name]}; re-rendering the scene")
+            return None
+    
+    loaded = {}
+    for name, data in zip(names, downloads):
+        if name.startswith("clip"):
+            loaded[name] = write_temp_clip(data)
+        elif name == "voice":
+            loaded["voice"] = (data, decoded["voice"])
+        elif name in decoded:
+            loaded[name] = decoded[name]
+    return loaded
+
+async def store_scene_artifacts(project_id: str, scene: Dict, clips: Dict[str, bytes],
+                                voice: Optional[tuple], sfx_audio: Optional[np.ndarray],
+                                sample_rate: int, poster: Optional[bytes] = None) -> Dict[str, str]:
+    """Upload a scene's new artifacts (clips by artifact name); returns artifact name -> R2 key"""
+    uploads = {name: (data, f"{name}.mp4", "video/mp4") for name, data in clips.items()}
+    if poster:
+        uploads["poster"] = (poster, f"poster{IMAGE_FORMATS[PREVIEW_FORMAT][0]}", IMAGE_FORMATS[PREVIEW_FORMAT][2])
+    if voice:
+        uploads["voice"] = (voice[0], "voice.mp3", "audio/mpeg")
+    if sfx_audio is not None:
+        uploads["sfx"] = (bytes(encode_wav(sfx_audio, sample_rate)), "sfx.wav", "audio/wav")
+    
+    artifacts = {}
+    for name, (content, file_name, content_type) in uploads.items():
+        key = scene_artifact_key(project_id, scene["key"], file_name)
+        if await upload_to_r2(content, key, content_type):
+            artifacts[name] = key
+    return artifacts
+
+async def upload_previews(generation_id: str, posters: List[Optional[np.ndarray]]) -> Dict[str, Optional[str]]:
+    """
+    Upload the video poster (first scene's poster frame) and a strip of one
+    thumbnail per scene next to the final video
+
+    Returns:
+        Dict with poster_url and thumbnail_strip_url (None when unavailable)
+    """
+    images = [poster for poster in posters if poster is not None]
+    if not images:
+        return {"poster_url": None, "thumbnail_strip_url": None}
+    
+    extension, _, content_type = IMAGE_FORMATS[PREVIEW_FORMAT]
+    strip = await asyncio.to_thread(encode_image, thumbnail_strip(images, THUMBNAIL_HEIGHT), PREVIEW_FORMAT)
+    poster = await asyncio.to_thread(encode_image, images[0], PREVIEW_FORMAT)
+    
+    previews = {"poster_url": None, "thumbnail_strip_url": None}
+    if poster:
+        previews["poster_url"] = await upload_to_r2(poster, f"videos/{generation_id}_poster{extension}", content_type)
+    if strip:
+        previews["thumbnail_strip_url"] = await upload_to_r2(strip, f"videos/{generation_id}_thumbs{extension}", content_type)
+    return previews
+
+def scene_poster(frames: np.ndarray) -> tuple:
+    """Capture a scene's poster frame from rendered frames; returns (image, encoded bytes)"""
+    poster = fit_image(select_poster_frame(frames), POSTER_MAX_WIDTH)
+    return poster, encode_image(poster, PREVIEW_FORMAT)
+
+def reframe_clip(frames: np.ndarray, aspect_ratio: str, fps: int) -> bytes:
+    """Derive and encode one output aspect ratio from a rendered clip"""
+    return encode_frames(reframe_frames(frames, aspect_ratio), fps)
+
+def mix_soundtrack(scenes: List[Dict], voices: List[Optional[tuple]],
+                   sfx_tracks: Dict[int, np.ndarray], sample_rate: int, duration: float) -> np.ndarray:
+    """Mix scene voice-overs and ducked sound effects in-process into one PCM stream"""
+    mixer = AudioMixer(sample_rate)
+    for scene, voice in zip(scenes, voices):
+        if voice:
+            mixer.add_stem(voice[1], scene["offset"], "voice")
+    for index, sfx_audio in sfx_tracks.items():
+        mixer.add_stem(sfx_audio, scenes[index]["offset"], "sfx", gain_db=SFX_GAIN_DB)
+    return mixer.render(duration)
+
+async def draft_abandoned(generation_id: str) -> bool:
+    """True when nobody has watched a progressive generation since its draft went out"""
+    return time.time() - await status_store.last_viewed(generation_id) > DRAFT_ABANDON_SECONDS
+
+async def update_status(generation_id: str, **fields) -> Dict:
+    """Merge fields into a generation's live status; subscribers on every replica are notified"""
+    status = await status_store.update(generation_id, fields)
+    if generation_persister:
+        await generation_persister.record(generation_id, fields)
+    return status
+
+async def set_status(generation_id: str, status: Dict, **record_fields) -> Dict:
+    """
+    Replace a generation's live status
+    
+    The status plus record_fields (stored only, e.g. the scene plan) is
+    persisted write-behind; terminal statuses are written immediately.
+    """
+    stored = await status_store.set(generation_id, status)
+    if generation_persister:
+        await generation_persister.record(generation_id, {**status, **record_fields})
+    return stored
+
 async def process_video_generation(generation_id: str, project_data: Dict):
     """Background task for video generation"""
     try:
-        # Update status
-        generation_status[generation_id] = {
+        await set_status(generation_id, {
             "status": "processing",
             "progress": 0.0,
             "message": "Starting video generation..."
-        }
-        
-        # Broadcast status
-        await broadcast_status(generation_id)
+        })
         
         # Initialize managers
         gemini_manager = GeminiManager()
         elevenlabs_manager = ElevenLabsManager()
         
-        # Step 1: Analyze script
-        generation_status[generation_id]["message"] = "Analyzing script..."
-        generation_status[generation_id]["progress"] = 10.0
-        await broadcast_status(generation_id)
+        # Step 1: Analyze script, reusing the previous plan when the script is unchanged
+        await update_status(generation_id, message="Analyzing script...", progress=10.0)
         
-        script_analysis = await gemini_manager.analyze_script(project_data["script"])
+        project_id = project_data["project_id"]
+        previous_plan = await load_previous_plan(project_id)
+        if previous_plan and previous_plan.get("script") == project_data["script"]:
+            script_analysis = previous_plan["analysis"]
+        else:
+            script_analysis = await gemini_manager.analyze_script(project_data["script"])
+        analysis_snapshot = copy.deepcopy(script_analysis)
+        scenes = script_analysis["scenes"]
         
-        # Step 2: Generate video clips
-        generation_status[generation_id]["message"] = "Generating video clips..."
-        generation_status[generation_id]["progress"] = 30.0
-        await broadcast_status(generation_id)
+        sample_rate = ai_manager.stable_audio.sample_rate
+        fps = ai_manager.wan21_generator.model_specs["fps"]
+        progressive = project_data.get("progressive", False)
         
-        video_clips = []
-        for i, scene in enumerate(script_analysis["scenes"]):
-            # Generate optimized prompt
-            video_prompt = await gemini_manager.generate_video_prompt(scene["description"])
-            
-            # Generate video clip
-            video_path = ai_manager.generate_content(
-                video_prompt,
-                "video",
-                aspect_ratio=project_data["aspect_ratio"],
-                duration=scene["duration"]
+        # Unchanged scenes (same content hash) reuse the previous generation's artifacts
+        previous_scenes = {scene["key"]: scene for scene in (previous_plan or {}).get("scenes", [])}
+        for scene in scenes:
+            scene["key"] = scene_cache_key(scene, project_data)
+            scene["seed"] = int(scene["key"][:8], 16)
+        loaded = await asyncio.gather(*(
+            load_scene_artifacts(scene, previous_scenes[scene["key"]], sample_rate)
+            if scene["key"] in previous_scenes else asyncio.sleep(0)
+            for scene in scenes
+        ))
+        reused = {index: artifacts for index, artifacts in enumerate(loaded) if artifacts}
+        
+        # Step 2: Generate voice over per scene; measured lengths drive the video timeline
+        await update_status(generation_id, message="Generating voice over...", progress=20.0)
+        
+        async def scene_voice(index, scene):
+            if index in reused:
+                return reused[index].get("voice")
+            return await synthesize_scene_voice(
+                elevenlabs_manager, scene, project_data.get("voice_id"), sample_rate
             )
+        
+        voices = await asyncio.gather(*(scene_voice(i, scene) for i, scene in enumerate(scenes)))
+        total_duration = plan_scene_timeline(
+            scenes, [voice[1] if voice else None for voice in voices], sample_rate, fps
+        )
+        
+        # A reused clip is only valid if the timeline gives the scene the same frame count
+        for index in list(reused):
+            if previous_scenes[scenes[index]["key"]].get("num_frames") != scenes[index]["num_frames"]:
+                for name, path in reused.pop(index).items():
+                    if name.startswith("clip"):
+                        os.unlink(path)
+        
+        # Step 3: Generate video clips
+        await update_status(
+            generation_id, message="Generating video clips...", progress=30.0, reused_scenes=len(reused)
+        )
+        
+        # Sound effects render alongside the video clips
+        sfx_tasks = {
+            index: asyncio.create_task(generate_scene_sfx(
+                scene, project_data.get("tenant", "default"), project_data.get("priority", "interactive")
+            ))
+            for index, scene in enumerate(scenes) if index not in reused
+        }
+        
+        # Optimized prompts for every scene that needs rendering
+        new_scenes = [index for index in range(len(scenes)) if index not in reused]
+        video_prompts = await asyncio.gather(*(
+            gemini_manager.generate_video_prompt(scenes[index]["description"]) for index in new_scenes
+        ))
+        for index, video_prompt in zip(new_scenes, video_prompts):
+            scenes[index]["video_prompt"] = video_prompt
+        
+        async def render_scene(scene, **overrides):
+            # Generate exactly the frames the scene's voice-over occupies
+            options = {
+                "render_fps": project_data.get("render_fps"),
+                "render_scale": project_data.get("render_scale", 1.0),
+                **overrides
+            }
+            # Render slots are shared fairly between tenants, charged by rendered pixels
+            cost = scene["num_frames"] * options["render_scale"] ** 2
+            async with render_slots.slot(
+                project_data.get("tenant", "default"), cost, project_data.get("priority", "interactive")
+            ):
+                return await asyncio.to_thread(
+                    ai_manager.generate_frames,
+                    scene["video_prompt"],
+                    project_data["aspect_ratio"],
+                    fps=fps,
+                    num_frames=scene["num_frames"],
+                    seed=scene["seed"],
+                    **options
+                )
+        
+        # Extra output aspect ratios are derived from the master render, not rendered again
+        extra_ratios = [
+            ratio for ratio in project_data.get("output_aspect_ratios") or []
+            if ratio != project_data["aspect_ratio"]
+        ]
+        outputs = [None] + extra_ratios
+        clip_paths = {ratio: [None] * len(scenes) for ratio in outputs}
+        clip_data = {}
+        posters = [None] * len(scenes)
+        poster_data = {}
+        published = {}
+        seconds_saved = 0.0
+        
+        for i in reused:
+            scene = scenes[i]
+            scene["video_prompt"] = previous_scenes[scene["key"]].get("video_prompt")
+            posters[i] = reused[i].get("poster")
+            clip_paths[None][i] = reused[i]["clip"]
+            missing = [ratio for ratio in extra_ratios if clip_artifact_name(ratio) not in reused[i]]
+            frames = None
+            if missing:
+                frames = await asyncio.to_thread(decode_clip_frames, reused[i]["clip"])
+            clip_data[i] = {}
+            for ratio in extra_ratios:
+                name = clip_artifact_name(ratio)
+                if name in reused[i]:
+                    clip_paths[ratio][i] = reused[i][name]
+                elif frames is not None:
+                    clip_data[i][name] = await asyncio.to_thread(reframe_clip, frames, ratio, fps)
+                    clip_paths[ratio][i] = write_temp_clip(clip_data[i][name])
+        
+        # Progressive mode: publish a quick low-quality draft before the final render
+        draft_paths = []
+        draft_url = None
+        segments = None
+        if progressive and new_scenes:
+            draft_paths = list(clip_paths[None])
+            for count, i in enumerate(new_scenes):
+                draft = await render_scene(scenes[i], **DRAFT_RENDER)
+                if draft:
+                    frames, render_info = draft
+                    draft_paths[i] = write_temp_clip(
+                        await asyncio.to_thread(encode_frames, frames, render_info["fps"])
+                    )
+                await update_status(generation_id, progress=30.0 + (count + 1) / len(new_scenes) * 15.0)
+            
+            # The draft carries the voice-over only; sound effects may still be rendering
+            draft_pcm = await asyncio.to_thread(mix_soundtrack, scenes, voices, {}, sample_rate, total_duration)
+            draft_path = f"/tmp/draft_video_{generation_id}.mp4"
+            if all(draft_paths) and await combine_video_clips(draft_paths, draft_pcm, draft_path, sample_rate):
+                with open(draft_path, 'rb') as f:
+                    draft_url = await upload_to_r2(f.read(), f"videos/{generation_id}_draft.mp4", "video/mp4")
+                os.unlink(draft_path)
+            
+            if draft_url:
+                await status_store.touch(generation_id)
+                segments = [
+                    {
+                        "index": index,
+                        "start": scene["offset"],
+                        "duration": scene["duration"],
+                        "quality": "final" if index in reused else "draft",
+                        "url": r2_url(previous_scenes[scene["key"]]["artifacts"]["clip"]) if index in reused else None
+                    }
+                    for index, scene in enumerate(scenes)
+                ]
+                await update_status(
+                    generation_id,
+                    message="Draft ready, rendering final quality...",
+                    draft_url=draft_url,
+                    segments=segments
+                )
+            else:
+                progressive = False
+        
+        start_progress = 45.0 if progressive else 30.0
+        abandoned = False
+        for count, i in enumerate(new_scenes):
+            scene = scenes[i]
             
-            if video_path:
-                video_clips.append(video_path)
+            # Nobody is watching the draft: skip the remaining full-quality renders
+            if progressive and await draft_abandoned(generation_id):
+                abandoned = True
+                logger.info(f"Draft abandoned, stopping final render: {generation_id}")
+                break
+            
+            clip = await render_scene(scene)
+            
+            if clip:
+                frames, render_info = clip
+                seconds_saved += render_info.get("estimated_seconds_saved", 0.0)
+                clip_data[i] = {"clip": await asyncio.to_thread(encode_frames, frames, render_info["fps"])}
+                clip_paths[None][i] = write_temp_clip(clip_data[i]["clip"])
+                posters[i], poster_data[i] = await asyncio.to_thread(scene_poster, frames)
+                for ratio in extra_ratios:
+                    name = clip_artifact_name(ratio)
+                    clip_data[i][name] = await asyncio.to_thread(reframe_clip, frames, ratio, render_info["fps"])
+                    clip_paths[ratio][i] = write_temp_clip(clip_data[i][name])
+                
+                # Swap the final segment in as soon as it exists
+                if progressive:
+                    key = scene_artifact_key(project_id, scene["key"], "clip.mp4")
+                    url = await upload_to_r2(clip_data[i]["clip"], key, "video/mp4")
+                    if url:
+                        del clip_data[i]["clip"]
+                        published[i] = {"clip": key}
+                        segments[i].update({"quality": "final", "url": url})
             
             # Update progress
-            progress = 30.0 + (i + 1) / len(script_analysis["scenes"]) * 30.0
-            generation_status[generation_id]["progress"] = progress
-            await broadcast_status(generation_id)
-        
-        # Step 3: Generate voice over
-        generation_status[generation_id]["message"] = "Generating voice over..."
-        generation_status[generation_id]["progress"] = 70.0
-        await broadcast_status(generation_id)
-        
-        full_script = " ".join([scene["audio_text"] for scene in script_analysis["scenes"]])
-        speech_audio = await elevenlabs_manager.generate_speech(
-            full_script,
-            project_data.get("voice_id")
-        )
+            progress = start_progress + (count + 1) / len(new_scenes) * (80.0 - start_progress)
+            if segments:
+                await update_status(generation_id, progress=progress, segments=segments)
+            else:
+                await update_status(generation_id, progress=progress)
         
-        # Save audio to temp file
-        audio_file = None
-        if speech_audio:
-            with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as f:
-                f.write(speech_audio)
-                audio_file = f.name
+        for path in draft_paths:
+            if path and path not in clip_paths[None] and os.path.exists(path):
+                os.unlink(path)
+        
+        if abandoned:
+            for index in [index for index in sfx_tasks if index not in clip_data]:
+                sfx_tasks.pop(index).cancel()
+        sfx_results = dict(zip(sfx_tasks, await asyncio.gather(*sfx_tasks.values())))
+        sfx_tracks = {index: artifacts["sfx"] for index, artifacts in reused.items() if "sfx" in artifacts}
+        sfx_tracks.update({index: audio for index, audio in sfx_results.items() if audio is not None})
+        
+        # Store new scene artifacts while the final video is muxed
+        artifact_tasks = {
+            index: asyncio.create_task(store_scene_artifacts(
+                project_id, scenes[index], clips,
+                None if index in reused else voices[index], sfx_results.get(index), sample_rate,
+                poster_data.get(index)
+            ))
+            for index, clips in clip_data.items()
+        }
+        
+        async def record_plan():
+            # Record the per-scene plan so the next generation can reuse unchanged scenes
+            stored = dict(zip(artifact_tasks, await asyncio.gather(*artifact_tasks.values())))
+            return {
+                "script": project_data["script"],
+                "analysis": analysis_snapshot,
+                "scenes": [
+                    {
+                        "key": scene["key"],
+                        "seed": scene["seed"],
+                        "video_prompt": scene.get("video_prompt"),
+                        "num_frames": scene["num_frames"],
+                        "artifacts": {
+                            **(previous_scenes[scene["key"]]["artifacts"] if index in reused else {}),
+                            **published.get(index, {}),
+                            **stored.get(index, {})
+                        },
+                    }
+                    for index, scene in enumerate(scenes)
+                ],
+            }
+        
+        def cleanup_clips():
+            for clip in [path for paths in clip_paths.values() for path in paths if path]:
+                if os.path.exists(clip):
+                    os.unlink(clip)
+        
+        if abandoned:
+            # The draft becomes the result; finished final scenes are kept for reuse
+            plan = await record_plan()
+            await set_status(generation_id, {
+                "status": "completed",
+                "progress": 100.0,
+                "message": "Draft kept; final render skipped",
+                "quality": "draft",
+                "video_url": draft_url,
+                "draft_url": draft_url,
+                "reused_scenes": len(reused)
+            }, plan=plan, completed_at=datetime.utcnow())
+            cleanup_clips()
+            return
         
         # Step 4: Combine video and audio
-        generation_status[generation_id]["message"] = "Combining video and audio..."
-        generation_status[generation_id]["progress"] = 85.0
-        await broadcast_status(generation_id)
+        await update_status(generation_id, message="Combining video and audio...", progress=85.0)
         
-        if video_clips and audio_file:
-            output_path = f"/tmp/final_video_{generation_id}.mp4"
-            success = await combine_video_clips(video_clips, audio_file, output_path)
+        if all(clip_paths[None]) and any(voice for voice in voices):
+            audio_pcm = await asyncio.to_thread(
+                mix_soundtrack, scenes, voices, sfx_tracks, sample_rate, total_duration
+            )
+            
+            # Mux every output; derived aspect ratios share the soundtrack
+            output_paths = {}
+            for ratio in outputs:
+                if ratio is None:
+                    output_paths[ratio] = f"/tmp/final_video_{generation_id}.mp4"
+                else:
+                    output_paths[ratio] = f"/tmp/final_video_{generation_id}_{ratio.replace(':', 'x')}.mp4"
+            
+            results = await asyncio.gather(*(
+                combine_video_clips(clip_paths[ratio], audio_pcm, output_paths[ratio], sample_rate)
+                for ratio in outputs
+            ))
+            success = all(results) and all(all(clip_paths[ratio]) for ratio in outputs)
             
             if success:
                 # Upload to R2
-                generation_status[generation_id]["message"] = "Uploading final video..."
-                generation_status[generation_id]["progress"] = 95.0
-                await broadcast_status(generation_id)
-                
-                with open(output_path, 'rb') as f:
-                    video_content = f.read()
-                
-                video_url = await upload_to_r2(
-                    video_content,
-                    f"videos/{generation_id}.mp4",
-                    "video/mp4"
-                )
+                await update_status(generation_id, message="Uploading final video...", progress=95.0)
                 
-                if video_url:
-                    # Update database
-                    await db.generations.update_one(
-                        {"generation_id": generation_id},
-                        {
-                            "$set": {
-                                "status": "completed",
-                                "progress": 100.0,
-                                "video_url": video_url,
-                                "completed_at": datetime.utcnow()
-                            }
-                        }
+                video_urls = {}
+                for ratio, output_path in output_paths.items():
+                    with open(output_path, 'rb') as f:
+                        video_content = f.read()
+                    
+                    video_urls[ratio or project_data["aspect_ratio"]] = await upload_to_r2(
+                        video_content,
+                        f"videos/{os.path.basename(output_path).replace('final_video_', '')}",
+                        "video/mp4"
                     )
+                video_url = video_urls[project_data["aspect_ratio"]]
+                previews = await upload_previews(generation_id, posters)
+                
+                if all(video_urls.values()):
+                    plan = await record_plan()
                     
-                    generation_status[generation_id] = {
+                    await set_status(generation_id, {
                         "status": "completed",
                         "progress": 100.0,
                         "message": "Video generation completed!",
-                        "video_url": video_url
-                    }
-                    
-                    await broadcast_status(generation_id)
+                        "quality": "final",
+                        "video_url": video_url,
+                        "video_urls": video_urls,
+                        **previews,
+                        "render_seconds_saved": round(seconds_saved, 2),
+                        "reused_scenes": len(reused)
+                    }, plan=plan, completed_at=datetime.utcnow())
                     
                     # Clean up temp files
-                    for clip in video_clips:
-                        if os.path.exists(clip):
-                            os.unlink(clip)
-                    if os.path.exists(audio_file):
-                        os.unlink(audio_file)
-                    if os.path.exists(output_path):
-                        os.unlink(output_path)
+                    cleanup_clips()
+                    for output_path in output_paths.values():
+                        if os.path.exists(output_path):
+                            os.unlink(output_path)
                     
                     logger.info(f"Video generation completed: {generation_id}")
                     return
         
         # If we get here, something failed
-        generation_status[generation_id] = {
+        await set_status(generation_id, {
             "status": "failed",
             "progress": 0.0,
             "message": "Video generation failed"
-        }
-        await broadcast_status(generation_id)
+        })
         
     except Exception as e:
         logger.error(f"Video generation failed: {str(e)}")
-        generation_status[generation_id] = {
+        await set_status(generation_id, {
             "status": "failed",
             "progress": 0.0,
             "message": f"Error: {str(e)}"
-        }
-        await broadcast_status(generation_id)
-
-async def broadcast_status(generation_id: str):
-    """Broadcast status to connected WebSocket clients"""
-    if generation_id in active_connections:
-        try:
-            await active_connections[generation_id].send_json(generation_status[generation_id])
-        except:
-            # Remove broken connection
-            del active_connections[generation_id]
+        })
+    finally:
+        admission.release(generation_id)
 
 # --- API Routes ---
 
@@ -551,6 +1148,30 @@ async def startup_event():
     # Connect to MongoDB
     await connect_to_mongo()
     
+    # Shared live status (STATUS_STORE=mongo lets every replica serve every generation)
+    global status_store
+    global broadcast_hub
+    status_store = create_status_store(db)
+    broadcast_hub = BroadcastHub(status_store, touch_interval=DRAFT_ABANDON_SECONDS / 2)
+    await status_store.start()
+    
+    # Write-behind persistence of generation progress
+    global generation_persister
+    if db is not None:
+        generation_persister = GenerationPersister(db.generations, interval=PERSIST_INTERVAL_SECONDS)
+        await generation_persister.start()
+    else:
+        logger.warning("No MongoDB connection; generation progress will not be persisted")
+    
+    # Generation workers: interactive before batch, fair between tenants, cheapest first, with aging
+    global generation_scheduler
+    generation_scheduler = GenerationScheduler(
+        process_video_generation, workers=GENERATION_WORKERS,
+        aging_rate=SCHEDULER_AGING_RATE, promote_after=BATCH_PROMOTE_SECONDS,
+        fair_share=FairShare(TENANT_WEIGHTS)
+    )
+    await generation_scheduler.start()
+    
     # Initialize AI models
     ai_manager.load_models()
     
@@ -559,6 +1180,11 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
+    if generation_scheduler:
+        await generation_scheduler.close()
+    await status_store.close()
+    if generation_persister:
+        await generation_persister.close()
     await close_mongo_connection()
 
 @app.get("/")
@@ -575,28 +1201,127 @@ async def health_check():
         "ai_models": {
             "wan21": ai_manager.wan21_generator.loaded,
             "stable_audio": ai_manager.stable_audio.loaded
-        }
+        },
+        "websockets": broadcast_hub.snapshot(),
+        "admission": admission.snapshot()
+    }
+
+@app.get("/api/metrics/queries")
+async def get_query_metrics():
+    """MongoDB command timings per collection and write-behind counters"""
+    return {
+        **query_metrics.snapshot(),
+        "persister": generation_persister.stats if generation_persister else None
+    }
+
+@app.get("/api/metrics/scheduler")
+async def get_scheduler_metrics():
+    """Generation queue depth and queue-wait statistics per priority class and tenant, and render slot usage"""
+    return {
+        **(generation_scheduler.snapshot() if generation_scheduler else {}),
+        "render_slots": render_slots.snapshot()
+    }
+
+def project_document(request: ProjectRequest, owner: str) -> Dict:
+    """New project record"""
+    return {
+        "project_id": str(uuid.uuid4()),
+        "owner": owner,
+        "script": request.script,
+        "aspect_ratio": request.aspect_ratio,
+        "voice_id": request.voice_id,
+        "voice_name": request.voice_name,
+        "status": "created",
+        "created_at": datetime.utcnow()
     }
 
+def generation_document(request: GenerationRequest) -> Dict:
+    """New queued generation record"""
+    return {
+        "generation_id": str(uuid.uuid4()),
+        "project_id": request.project_id,
+        "status": "queued",
+        "progress": 0.0,
+        "created_at": datetime.utcnow()
+    }
+
+def generation_cost(request: GenerationRequest) -> Dict:
+    """Estimated scenes, duration and worker-seconds of a generation"""
+    return estimate_job_cost(
+        request.script, request.render_scale, request.render_fps,
+        len(set(request.output_aspect_ratios) - {request.aspect_ratio}), request.progressive
+    )
+
+def api_key_identity(request: Request) -> Optional[str]:
+    """Identity of the caller's X-API-Key, or None when it is missing or not a known key"""
+    api_key = request.headers.get("x-api-key")
+    if not api_key or not any(hmac.compare_digest(api_key, known) for known in CLIENT_API_KEYS):
+        return None
+    return f"key:{hashlib.sha1(api_key.encode()).hexdigest()[:16]}"
+
+def client_identity(request: Request) -> str:
+    """Caller a generation is charged to: its known API key, else its address"""
+    return api_key_identity(request) or f"ip:{request.client.host if request.client else 'unknown'}"
+
+def generation_tenant(request: Request, project: Dict) -> str:
+    """Tenant a generation's work is shared under: the caller's known API key, else the project owner"""
+    return api_key_identity(request) or project.get("owner") or client_identity(request)
+
+def generation_job(request: GenerationRequest, tenant: str, priority: str) -> Dict:
+    """Job parameters handed to process_video_generation"""
+    return {
+        "project_id": request.project_id,
+        "tenant": tenant,
+        "priority": priority,
+        "script": request.script,
+        "aspect_ratio": request.aspect_ratio,
+        "voice_id": request.voice_id,
+        "render_fps": request.render_fps,
+        "render_scale": request.render_scale,
+        "output_aspect_ratios": request.output_aspect_ratios,
+        "progressive": request.progressive
+    }
+
+def unsupported_aspect_ratios(request: GenerationRequest) -> List[str]:
+    """Requested output aspect ratios that cannot be derived"""
+    return [ratio for ratio in request.output_aspect_ratios if ratio not in OUTPUT_ASPECT_RATIOS]
+
+def validation_message(error: ValidationError) -> str:
+    """One-line summary of a pydantic validation error"""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors()
+    )
+
+async def insert_batch(collection, documents: List[Dict]) -> Dict[int, str]:
+    """
+    Insert documents with one unordered insert_many
+    
+    Returns:
+        Dict of document position -> error message for documents that failed
+    """
+    if not documents:
+        return {}
+    try:
+        await collection.insert_many(documents, ordered=False)
+        return {}
+    except BulkWriteError as e:
+        return {error["index"]: error.get("errmsg", "Insert failed") for error in e.details.get("writeErrors", [])}
+
+def batch_response(results: List[BatchItemResult]) -> BatchResponse:
+    """Batch response with success and failure counts"""
+    failed = sum(1 for result in results if result.error)
+    return BatchResponse(succeeded=len(results) - failed, failed=failed, results=results)
+
 @app.post("/api/projects", response_model=ProjectResponse)
-async def create_project(request: ProjectRequest):
+async def create_project(request: ProjectRequest, http_request: Request):
     """Create a new project"""
     try:
-        project_id = str(uuid.uuid4())
-        project_data = {
-            "project_id": project_id,
-            "script": request.script,
-            "aspect_ratio": request.aspect_ratio,
-            "voice_id": request.voice_id,
-            "voice_name": request.voice_name,
-            "status": "created",
-            "created_at": datetime.utcnow()
-        }
+        project_data = project_document(request, client_identity(http_request))
         
         await db.projects.insert_one(project_data)
         
         return ProjectResponse(
-            project_id=project_id,
+            project_id=project_data["project_id"],
             status="created",
             created_at=project_data["created_at"]
         )
@@ -608,12 +1333,9 @@ async def create_project(request: ProjectRequest):
 async def get_project(project_id: str):
     """Get project details"""
     try:
-        project = await db.projects.find_one({"project_id": project_id})
+        project = await db.projects.find_one({"project_id": project_id}, {"_id": 0, "owner": 0})
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
-        
-        # Remove MongoDB ObjectId
-        project.pop('_id', None)
         return project
     except HTTPException:
         raise
@@ -622,41 +1344,54 @@ async def get_project(project_id: str):
         raise HTTPException(status_code=500, detail="Failed to get project")
 
 @app.post("/api/generate", response_model=GenerationResponse)
-async def start_generation(request: GenerationRequest, background_tasks: BackgroundTasks):
-    """Start video generation"""
+async def start_generation(request: GenerationRequest, http_request: Request):
+    """
+    Start video generation
+    
+    The job's compute cost is estimated up front. When the backlog or the
+    caller's share of it has no room, the request is refused with 429 and a
+    Retry-After header; otherwise it is queued with an ETA.
+    """
     try:
+        unsupported = unsupported_aspect_ratios(request)
+        if unsupported:
+            raise HTTPException(status_code=400, detail=f"Unsupported output aspect ratios: {unsupported}")
+        
         # Check if project exists
-        project = await db.projects.find_one({"project_id": request.project_id})
+        project = await db.projects.find_one({"project_id": request.project_id}, {"_id": 1, "owner": 1})
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
         
-        generation_id = str(uuid.uuid4())
-        generation_data = {
-            "generation_id": generation_id,
-            "project_id": request.project_id,
-            "status": "queued",
-            "progress": 0.0,
-            "created_at": datetime.utcnow()
-        }
+        generation_data = generation_document(request)
+        estimate = generation_cost(request)
+        decision = admission.admit(client_identity(http_request), generation_data["generation_id"], estimate["cost"])
+        if not decision.admitted:
+            raise HTTPException(
+                status_code=429, detail=decision.reason,
+                headers={"Retry-After": str(math.ceil(decision.retry_after))}
+            )
+        generation_data.update(estimated_cost=decision.cost, eta_seconds=round(decision.eta_seconds))
         
-        await db.generations.insert_one(generation_data)
+        try:
+            await db.generations.insert_one(generation_data)
+        except Exception:
+            admission.release(generation_data["generation_id"])
+            raise
         
-        # Start background task
-        background_tasks.add_task(
-            process_video_generation,
-            generation_id,
-            {
-                "script": request.script,
-                "aspect_ratio": request.aspect_ratio,
-                "voice_id": request.voice_id
-            }
+        tenant = generation_tenant(http_request, project)
+        priority = request.priority or "interactive"
+        await generation_scheduler.submit(
+            generation_data["generation_id"], generation_job(request, tenant, priority),
+            priority=priority, cost=decision.cost, tenant=tenant
         )
         
         return GenerationResponse(
-            generation_id=generation_id,
+            generation_id=generation_data["generation_id"],
             status="queued",
             progress=0.0,
-            message="Generation queued"
+            message=f"Generation queued, estimated to finish in {round(decision.eta_seconds)}s",
+            estimated_cost=decision.cost,
+            eta_seconds=round(decision.eta_seconds)
         )
     except HTTPException:
         raise
@@ -664,27 +1399,298 @@ async def start_generation(request: GenerationRequest, background_tasks: Backgro
         logger.error(f"Generation start failed: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to start generation")
 
-@app.get("/api/generate/{generation_id}")
-async def get_generation_status(generation_id: str):
-    """Get generation status"""
+@app.post("/api/projects/batch", response_model=BatchResponse)
+async def create_projects_batch(request: BatchRequest, http_request: Request):
+    """
+    Create many projects in one call
+    
+    Items are validated independently and all valid ones are written with one
+    insert_many; results are returned per item, in request order.
+    """
+    owner = client_identity(http_request)
+    results = [BatchItemResult(index=index) for index in range(len(request.items))]
+    documents, positions = [], []
+    for index, item in enumerate(request.items):
+        try:
+            documents.append(project_document(ProjectRequest(**item), owner))
+            positions.append(index)
+        except ValidationError as e:
+            results[index].error = validation_message(e)
+    
+    try:
+        errors = await insert_batch(db.projects, documents)
+    except Exception as e:
+        logger.error(f"Batch project creation failed: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to create projects")
+    
+    for position, (index, document) in enumerate(zip(positions, documents)):
+        if position in errors:
+            results[index].error = errors[position]
+        else:
+            results[index].id = document["project_id"]
+            results[index].status = "created"
+    return batch_response(results)
+
+@app.post("/api/generate/batch", response_model=BatchResponse)
+async def start_generation_batch(request: BatchRequest, http_request: Request):
+    """
+    Queue many generations in one call
+    
+    Items are validated together (including one $in lookup for all referenced
+    projects), admitted one by one against the caller's budget, written with
+    one insert_many and queued. Results are returned per item, in request order.
+    """
+    client_id = client_identity(http_request)
+    results = [BatchItemResult(index=index) for index in range(len(request.items))]
+    valid = []
+    for index, item in enumerate(request.items):
+        try:
+            generation_request = GenerationRequest(**item)
+        except ValidationError as e:
+            results[index].error = validation_message(e)
+            continue
+        unsupported = unsupported_aspect_ratios(generation_request)
+        if unsupported:
+            results[index].error = f"Unsupported output aspect ratios: {unsupported}"
+            continue
+        valid.append((index, generation_request))
+    
     try:
-        # Check memory first
-        if generation_id in generation_status:
-            return generation_status[generation_id]
+        project_ids = list({generation_request.project_id for _, generation_request in valid})
+        existing = {
+            project["project_id"]: project
+            async for project in db.projects.find(
+                {"project_id": {"$in": project_ids}}, {"_id": 0, "project_id": 1, "owner": 1}
+            )
+        }
         
-        # Check database
-        generation = await db.generations.find_one({"generation_id": generation_id})
-        if not generation:
-            raise HTTPException(status_code=404, detail="Generation not found")
+        queued = []
+        for index, generation_request in valid:
+            if generation_request.project_id not in existing:
+                results[index].error = "Project not found"
+                continue
+            document = generation_document(generation_request)
+            decision = admission.admit(
+                client_id, document["generation_id"], generation_cost(generation_request)["cost"]
+            )
+            if not decision.admitted:
+                results[index].error = f"{decision.reason}; retry after {math.ceil(decision.retry_after)}s"
+                continue
+            document.update(estimated_cost=decision.cost, eta_seconds=round(decision.eta_seconds))
+            queued.append((index, generation_request, document))
+        
+        try:
+            errors = await insert_batch(db.generations, [document for _, _, document in queued])
+        except Exception:
+            for _, _, document in queued:
+                admission.release(document["generation_id"])
+            raise
+    except Exception as e:
+        logger.error(f"Batch generation start failed: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to start generations")
+    
+    for position, (index, generation_request, document) in enumerate(queued):
+        if position in errors:
+            admission.release(document["generation_id"])
+            results[index].error = errors[position]
+            continue
+        results[index].id = document["generation_id"]
+        results[index].status = "queued"
+        tenant = generation_tenant(http_request, existing[generation_request.project_id])
+        priority = generation_request.priority or "batch"
+        await generation_scheduler.submit(
+            document["generation_id"], generation_job(generation_request, tenant, priority),
+            priority=priority, cost=document["estimated_cost"], tenant=tenant
+        )
+    return batch_response(results)
+
+@app.get("/api/projects")
+async def list_projects(limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE), cursor: Optional[str] = None):
+    """List projects newest first (keyset paginated; scripts are left out)"""
+    try:
+        return await keyset_page(
+            db.projects, {}, "project_id", {"_id": 0, "script": 0, "owner": 0}, limit, cursor
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to list projects: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to list projects")
+
+@app.get("/api/projects/{project_id}/generations")
+async def list_project_generations(project_id: str, limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+                                   cursor: Optional[str] = None):
+    """List a project's generations newest first, with live status merged in (keyset paginated)"""
+    try:
+        page = await keyset_page(
+            db.generations, {"project_id": project_id}, "generation_id", STATUS_PROJECTION, limit, cursor
+        )
+        live = await status_store.get_many([item["generation_id"] for item in page["items"]])
+        page["items"] = [{**item, **live.get(item["generation_id"], {})} for item in page["items"]]
+        return page
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to list generations: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to list generations")
+
+@app.post("/api/generate/status")
+async def get_generation_statuses(request: BulkStatusRequest):
+    """
+    Status of many generations in one call
+    
+    Live statuses come from the status store; the rest are read with a single
+    $in query. Unknown ids are listed under 'missing'.
+    """
+    try:
+        generation_ids = list(dict.fromkeys(request.generation_ids))
+        statuses = await status_store.get_many(generation_ids)
+        
+        remaining = [generation_id for generation_id in generation_ids if generation_id not in statuses]
+        if remaining:
+            async for generation in db.generations.find({"generation_id": {"$in": remaining}}, STATUS_PROJECTION):
+                statuses[generation["generation_id"]] = generation
+        
+        return {
+            "statuses": jsonable_encoder(statuses),
+            "missing": [generation_id for generation_id in generation_ids if generation_id not in statuses]
+        }
+    except Exception as e:
+        logger.error(f"Failed to get generation statuses: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to get generation statuses")
+
+def status_etag(generation_id: str, version: Any) -> str:
+    """Entity tag of a generation status version"""
+    return f'"{generation_id}-{version}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header covers an entity tag"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+async def load_terminal_status(generation_id: str) -> Optional[tuple]:
+    """
+    Stored status of a generation without live status, as (body, etag)
+    
+    Completed and failed records never change, so they are cached in process
+    and served without touching MongoDB again.
+    """
+    if generation_id in terminal_status_cache:
+        terminal_status_cache.move_to_end(generation_id)
+        return terminal_status_cache[generation_id]
+    
+    generation = await db.generations.find_one({"generation_id": generation_id}, STATUS_PROJECTION)
+    if not generation:
+        return None
+    body = jsonable_encoder(generation)
+    etag = status_etag(generation_id, hashlib.sha1(json.dumps(body, sort_keys=True).encode()).hexdigest()[:16])
+    if generation.get("status") in TERMINAL_STATUSES:
+        terminal_status_cache[generation_id] = (body, etag)
+        if len(terminal_status_cache) > TERMINAL_CACHE_SIZE:
+            terminal_status_cache.popitem(last=False)
+    return body, etag
+
+@app.get("/api/generate/{generation_id}")
+async def get_generation_status(generation_id: str,
+                                wait: float = Query(0.0, ge=0.0, le=MAX_STATUS_WAIT_SECONDS),
+                                if_none_match: Optional[str] = Header(None)):
+    """
+    Get generation status
+    
+    Responses carry an ETag. With If-None-Match and no change the response is
+    304; with wait > 0 the request is held until the status changes or wait
+    seconds pass (long-poll), then answered with the new status or 304.
+    """
+    try:
+        # Subscribe before reading so a change during the read is not missed
+        async with status_store.subscribe(generation_id) as updates:
+            status = await status_store.get(generation_id)
+            if status:
+                await status_store.touch(generation_id)
+                body, etag = status, status_etag(generation_id, status["version"])
+            else:
+                stored = await load_terminal_status(generation_id)
+                if not stored:
+                    raise HTTPException(status_code=404, detail="Generation not found")
+                body, etag = stored
+            
+            # Long-poll: hold an unchanged, unfinished status until the next version
+            if etag_matches(if_none_match, etag) and wait and body.get("status") not in TERMINAL_STATUSES:
+                try:
+                    body = await asyncio.wait_for(updates.get(), wait)
+                    etag = status_etag(generation_id, body["version"])
+                except asyncio.TimeoutError:
+                    pass
         
-        generation.pop('_id', None)
-        return generation
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        return JSONResponse(body, headers=headers)
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Failed to get generation status: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to get generation status")
 
+def sse_event(status: Dict) -> str:
+    """Format a status as a Server-Sent Event whose id is the status version"""
+    return f"id: {status['version']}\nevent: status\ndata: {json.dumps(status, default=str)}\n\n"
+
+@app.get("/api/generate/{generation_id}/events")
+async def generation_events(generation_id: str, request: Request,
+                            last_event_id: Optional[str] = Header(None)):
+    """
+    Server-Sent Events stream of generation status
+    
+    Each event carries the full status with its version as the event id. A
+    reconnecting client sends Last-Event-ID and only receives a status when it
+    is newer than the one it already has. The stream ends after a terminal
+    status; comment heartbeats keep idle proxies from closing it.
+    """
+    stored = None
+    if not await status_store.get(generation_id):
+        stored = await db.generations.find_one({"generation_id": generation_id}, STATUS_PROJECTION)
+        if not stored:
+            raise HTTPException(status_code=404, detail="Generation not found")
+    
+    try:
+        seen_version = int(last_event_id) if last_event_id else 0
+    except ValueError:
+        seen_version = 0
+    
+    async def stream():
+        nonlocal seen_version
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        if stored and stored.get("status") in TERMINAL_STATUSES:
+            # Finished before this replica had live status: the stored record is final
+            yield f"event: status\ndata: {json.dumps(stored, default=str)}\n\n"
+            return
+        async with status_store.subscribe(generation_id) as updates:
+            # Snapshot after subscribing, so no update falls in between
+            current = await status_store.get(generation_id)
+            while True:
+                if current and current["version"] > seen_version:
+                    seen_version = current["version"]
+                    yield sse_event(current)
+                    if current.get("status") in TERMINAL_STATUSES:
+                        return
+                try:
+                    current = await asyncio.wait_for(updates.get(), SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    current = None
+                    yield ": keep-alive\n\n"
+                await status_store.touch(generation_id)
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/api/voices", response_model=List[VoiceResponse])
 async def get_voices():
     """Get available voices"""
@@ -700,16 +1706,8 @@ async def get_voices():
 async def websocket_endpoint(websocket: WebSocket, generation_id: str):
     """WebSocket endpoint for real-time updates"""
     await websocket.accept()
-    active_connections[generation_id] = websocket
-    
-    try:
-        while True:
-            # Keep connection alive
-            await websocket.receive_text()
-    except WebSocketDisconnect:
-        if generation_id in active_connections:
-            del active_connections[generation_id]
+    await broadcast_hub.attach(generation_id, websocket)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8001, ws_per_message_deflate=WS_PER_MESSAGE_DEFLATE)
\ No newline at end of file
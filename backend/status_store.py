@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Generation Status Store for Script-to-Video
+Shared, versioned live status with publish/subscribe, so any API replica can
+serve and stream any generation's progress
+"""
+import os
+import time
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, List, AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+class StatusStore(ABC):
+    """
+    Interface of live generation status backends
+
+    Every write bumps a per-generation version and returns the stored status
+    (with its 'version' field). Subscribers receive each new version once, in
+    order; stale or duplicate deliveries are dropped here, so backends may
+    publish the same version more than once. Watch marks (touch) are written
+    at most once per touch_interval seconds per generation.
+    """
+
+    def __init__(self, touch_interval: float = 10.0):
+        self._subscribers: Dict[str, Dict[str, Any]] = {}
+        self.touch_interval = touch_interval
+        self._touched: Dict[str, float] = {}
+
+    async def start(self):
+        """Start background work (e.g. change stream watchers)"""
+
+    async def close(self):
+        """Stop background work"""
+
+    @abstractmethod
+    async def get(self, generation_id: str) -> Optional[Dict[str, Any]]:
+        """Current status, or None if the generation has no live status"""
+
+    @abstractmethod
+    async def get_many(self, generation_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Current statuses of the generations that have live status"""
+
+    @abstractmethod
+    async def set(self, generation_id: str, status: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace a generation's status"""
+
+    @abstractmethod
+    async def update(self, generation_id: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge fields into a generation's status"""
+
+    async def touch(self, generation_id: str):
+        """Record that a client is watching the generation (throttled; unknown ids are ignored)"""
+        now = time.monotonic()
+        if now - self._touched.get(generation_id, float("-inf")) < self.touch_interval:
+            return
+        if len(self._touched) > 10000:
+            self._touched = {
+                touched_id: at for touched_id, at in self._touched.items() if now - at < self.touch_interval
+            }
+        self._touched[generation_id] = now
+        await self._touch(generation_id)
+
+    @abstractmethod
+    async def _touch(self, generation_id: str):
+        """Write a watch mark for a generation that has live status"""
+
+    @abstractmethod
+    async def last_viewed(self, generation_id: str) -> float:
+        """Wall-clock time a client last watched the generation (0 if never)"""
+
+    @asynccontextmanager
+    async def subscribe(self, generation_id: str) -> AsyncIterator[asyncio.Queue]:
+        """
+        Subscribe to a generation's status changes
+
+        Yields:
+            asyncio.Queue receiving each new status dict in version order
+        """
+        queue = asyncio.Queue()
+        entry = self._subscribers.setdefault(generation_id, {"queues": set(), "version": 0})
+        entry["queues"].add(queue)
+        try:
+            yield queue
+        finally:
+            entry["queues"].discard(queue)
+            if not entry["queues"]:
+                self._subscribers.pop(generation_id, None)
+
+    def _publish(self, generation_id: str, status: Dict[str, Any]):
+        """Deliver a status to local subscribers if it is newer than the last one delivered"""
+        entry = self._subscribers.get(generation_id)
+        if not entry or status.get("version", 0) <= entry["version"]:
+            return
+        entry["version"] = status["version"]
+        for queue in entry["queues"]:
+            queue.put_nowait(status)
+
+
+class LocalStatusStore(StatusStore):
+    """
+    In-process status store for single-worker deployments and development
+
+    Finished generations are dropped terminal_ttl seconds after their last
+    write (their stored record serves them from then on) and any generation
+    idle for ttl_seconds is dropped too.
+    """
+
+    def __init__(self, ttl_seconds: float = 24 * 3600, terminal_ttl: float = 300.0, touch_interval: float = 10.0):
+        super().__init__(touch_interval)
+        self.ttl_seconds = ttl_seconds
+        self.terminal_ttl = terminal_ttl
+        self._statuses: Dict[str, Dict[str, Any]] = {}
+        self._viewed: Dict[str, float] = {}
+        self._updated: Dict[str, float] = {}
+        self._evicted = time.monotonic()
+
+    def _evict(self):
+        now = time.monotonic()
+        if now - self._evicted < min(self.terminal_ttl, 60.0):
+            return
+        self._evicted = now
+        for generation_id, updated in list(self._updated.items()):
+            terminal = self._statuses[generation_id].get("status") in TERMINAL_STATUSES
+            if now - updated > (self.terminal_ttl if terminal else self.ttl_seconds):
+                del self._statuses[generation_id], self._updated[generation_id]
+                self._viewed.pop(generation_id, None)
+
+    async def get(self, generation_id: str) -> Optional[Dict[str, Any]]:
+        return self._statuses.get(generation_id)
+
+    async def get_many(self, generation_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        return {
+            generation_id: self._statuses[generation_id]
+            for generation_id in generation_ids if generation_id in self._statuses
+        }
+
+    async def set(self, generation_id: str, status: Dict[str, Any]) -> Dict[str, Any]:
+        version = self._statuses.get(generation_id, {}).get("version", 0) + 1
+        stored = {**status, "version": version}
+        self._evict()
+        self._statuses[generation_id] = stored
+        self._updated[generation_id] = time.monotonic()
+        self._publish(generation_id, stored)
+        return stored
+
+    async def update(self, generation_id: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.set(generation_id, {**self._statuses.get(generation_id, {}), **fields})
+
+    async def _touch(self, generation_id: str):
+        if generation_id in self._statuses:
+            self._viewed[generation_id] = time.time()
+
+    async def last_viewed(self, generation_id: str) -> float:
+        return self._viewed.get(generation_id, 0.0)
+
+
+class MongoStatusStore(StatusStore):
+    """
+    Status store shared by all replicas through a MongoDB collection
+
+    Each write is a single atomic pipeline update that merges the status and
+    increments the version. Writes are published to local subscribers
+    immediately; a change stream (requires a replica set) delivers writes made
+    by other replicas.
+    """
+
+    def __init__(self, db, collection: str = "live_status", ttl_seconds: int = 7 * 24 * 3600,
+                 touch_interval: float = 10.0):
+        """
+        Initialize Mongo status store
+
+        Args:
+            db: Motor database
+            collection: Collection holding one document per generation
+            ttl_seconds: Documents expire this long after their last write
+            touch_interval: Least seconds between watch marks written for one generation
+        """
+        super().__init__(touch_interval)
+        self.collection = db[collection]
+        self.ttl_seconds = ttl_seconds
+        self._watcher: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _from_document(document: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if not document or "status" not in document:
+            return None
+        return {**document["status"], "version": document["version"]}
+
+    async def _write(self, generation_id: str, status_expression: Dict[str, Any]) -> Dict[str, Any]:
+        from pymongo import ReturnDocument
+
+        document = await self.collection.find_one_and_update(
+            {"_id": generation_id},
+            [{"$set": {
+                "status": status_expression,
+                "version": {"$add": [{"$ifNull": ["$version", 0]}, 1]},
+                "updated_at": "$$NOW",
+            }}],
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        stored = self._from_document(document)
+        self._publish(generation_id, stored)
+        return stored
+
+    async def get(self, generation_id: str) -> Optional[Dict[str, Any]]:
+        return self._from_document(await self.collection.find_one({"_id": generation_id}))
+
+    async def get_many(self, generation_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        statuses = {}
+        async for document in self.collection.find({"_id": {"$in": list(generation_ids)}}):
+            status = self._from_document(document)
+            if status:
+                statuses[document["_id"]] = status
+        return statuses
+
+    async def set(self, generation_id: str, status: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._write(generation_id, {"$literal": status})
+
+    async def update(self, generation_id: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._write(
+            generation_id, {"$mergeObjects": [{"$ifNull": ["$status", {}]}, {"$literal": fields}]}
+        )
+
+    async def _touch(self, generation_id: str):
+        # Never upsert: a read of an unknown id must not create a document
+        await self.collection.update_one(
+            {"_id": generation_id},
+            {"$set": {"viewed_at": time.time()}, "$currentDate": {"updated_at": True}}
+        )
+
+    async def last_viewed(self, generation_id: str) -> float:
+        document = await self.collection.find_one({"_id": generation_id}, {"viewed_at": 1})
+        return (document or {}).get("viewed_at", 0.0)
+
+    async def start(self):
+        await self.collection.create_index("updated_at", expireAfterSeconds=self.ttl_seconds)
+        self._watcher = asyncio.create_task(self._watch())
+
+    async def close(self):
+        if self._watcher:
+            self._watcher.cancel()
+
+    async def _watch(self):
+        """Relay changes from other replicas to local subscribers, resuming after errors"""
+        resume_token = None
+        pipeline = [{"$match": {"operationType": {"$in": ["insert", "update", "replace"]}}}]
+        while True:
+            try:
+                async with self.collection.watch(
+                    pipeline, full_document="updateLookup", resume_after=resume_token
+                ) as stream:
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        document = change.get("fullDocument")
+                        if document and document["_id"] in self._subscribers:
+                            status = self._from_document(document)
+                            if status:
+                                self._publish(document["_id"], status)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Status change stream failed: {str(e)}")
+                await asyncio.sleep(1.0)
+
+
+def create_status_store(db=None) -> StatusStore:
+    """
+    Create the status store selected by the STATUS_STORE environment variable
+
+    Args:
+        db: Motor database (required for 'mongo')
+
+    Returns:
+        StatusStore: 'local' (default) or 'mongo'
+    """
+    backend = os.getenv("STATUS_STORE", "local")
+    if backend == "mongo":
+        return MongoStatusStore(db)
+    if backend != "local":
+        logger.warning(f"Unknown STATUS_STORE '{backend}', using local store")
+    return LocalStatusStore()
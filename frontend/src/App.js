@@ -15,6 +15,9 @@ function App() {
   const [progressMessage, setProgressMessage] = useState('');
   const [generationStatus, setGenerationStatus] = useState('');
   const [videoUrl, setVideoUrl] = useState('');
+  const [posterUrl, setPosterUrl] = useState('');
+  const [draftUrl, setDraftUrl] = useState('');
+  const [progressive, setProgressive] = useState(false);
   const [isGenerating, setIsGenerating] = useState(false);
   const [error, setError] = useState('');
   const wsRef = useRef(null);
@@ -67,9 +70,13 @@ function App() {
       setProgress(data.progress || 0);
       setProgressMessage(data.message || '');
       setGenerationStatus(data.status || '');
+      if (data.draft_url) {
+        setDraftUrl(data.draft_url);
+      }
       
       if (data.status === 'completed' && data.video_url) {
         setVideoUrl(data.video_url);
+        setPosterUrl(data.poster_url || '');
         setIsGenerating(false);
         setCurrentStep('result');
       } else if (data.status === 'failed') {
@@ -146,7 +153,8 @@ function App() {
           project_id: projectId,
           script: script.trim(),
           aspect_ratio: aspectRatio,
-          voice_id: selectedVoice
+          voice_id: selectedVoice,
+          progressive: progressive
         }),
       });
 
@@ -173,6 +181,8 @@ function App() {
     setProgressMessage('');
     setGenerationStatus('');
     setVideoUrl('');
+    setPosterUrl('');
+    setDraftUrl('');
     setIsGenerating(false);
     setError('');
     
@@ -268,6 +278,18 @@ Finally, we'll demonstrate the real-time collaboration tools that keep your team
           </select>
         </div>
 
+        <div className="setting-group">
+          <label>Quick Draft Preview</label>
+          <label className="toggle-option">
+            <input
+              type="checkbox"
+              checked={progressive}
+              onChange={(e) => setProgressive(e.target.checked)}
+            />
+            <span>Show a low-quality draft first (uses extra render time)</span>
+          </label>
+        </div>
+
         <div className="setting-group">
           <label>Script Preview</label>
           <div className="script-preview">
@@ -320,6 +342,14 @@ Finally, we'll demonstrate the real-time collaboration tools that keep your team
           </div>
         </div>
 
+        {draftUrl && (
+          <div className="video-player">
+            <video controls className="result-video" src={draftUrl}>
+              Your browser does not support the video tag.
+            </video>
+          </div>
+        )}
+
         <div className="progress-steps">
           <div className={`progress-step ${progress > 10 ? 'completed' : progress > 0 ? 'active' : ''}`}>
             <div className="step-icon">📝</div>
@@ -368,7 +398,7 @@ Finally, we'll demonstrate the real-time collaboration tools that keep your team
               controls
               className="result-video"
               src={videoUrl}
-              poster="/api/placeholder/800/450"
+              poster={posterUrl || undefined}
             >
               Your browser does not support the video tag.
             </video>
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Synthetic Media Engines for Development Mode
+Deterministic, vectorized stand-ins for WAN 2.1 and Stable Audio Open output
+"""
+import zlib
+import logging
+import numpy as np
+from typing import Dict, Any, Optional, Tuple, Iterator
+
+logger = logging.getLogger(__name__)
+
+# Prompt keywords mapped to (base RGB, amplitude RGB) palettes
+VIDEO_PALETTES = {
+    "sunset": ((110, 40, 20), (140, 110, 60)),
+    "ocean": ((10, 40, 90), (50, 110, 160)),
+    "forest": ((20, 60, 20), (70, 150, 60)),
+}
+
+# Prompt keywords mapped to synthetic audio voices, checked in order
+AUDIO_VOICES = (
+    ("piano", "piano"),
+    ("nature", "nature"),
+    ("forest", "nature"),
+    ("electronic", "electronic"),
+    ("drum", "drum"),
+)
+
+
+def prompt_seed(prompt: str, seed: Optional[int] = None) -> int:
+    """Derive a stable seed from the prompt when none is given"""
+    if seed is not None:
+        return int(seed)
+    return zlib.crc32(prompt.strip().lower().encode("utf-8"))
+
+
+class SyntheticVideoEngine:
+    """
+    Synthetic video generator for development mode
+
+    Renders a whole clip into one preallocated (frames, height, width, 3) uint8
+    array. Each channel is the sum of a horizontal and a vertical travelling
+    wave, so a frame is built from two broadcast uint8 vectors instead of
+    full-resolution random noise. The result is smooth, moves over time and
+    encodes to a realistic size.
+    """
+
+    def __init__(self, supported_aspect_ratios: Dict[str, Tuple[int, int]]):
+        """
+        Initialize synthetic video engine
+
+        Args:
+            supported_aspect_ratios: Mapping of aspect ratio to (width, height)
+        """
+        self.supported_aspect_ratios = supported_aspect_ratios
+
+    @staticmethod
+    def resolve_num_frames(num_frames: Optional[int] = None, fps: int = 24,
+                           duration: Optional[float] = None) -> int:
+        """Resolve the frame count from an explicit count or a duration (default: 1 second)"""
+        if num_frames is not None:
+            return max(1, int(num_frames))
+        if duration is not None:
+            return max(1, int(round(float(duration) * fps)))
+        return max(1, int(fps))
+
+    def _palette(self, prompt: str, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        """Pick base and amplitude colors from prompt keywords or the seed"""
+        lowered = prompt.lower()
+        for keyword, (base, amplitude) in VIDEO_PALETTES.items():
+            if keyword in lowered:
+                return np.array(base, dtype=np.float32), np.array(amplitude, dtype=np.float32)
+
+        base = rng.uniform(10, 90, 3).astype(np.float32)
+        amplitude = rng.uniform(60, 160, 3).astype(np.float32)
+        return base, np.minimum(amplitude, 255 - base)
+
+    def generate_video(self, prompt: str, aspect_ratio: str = "16:9",
+                       num_frames: Optional[int] = None, fps: int = 24,
+                       duration: Optional[float] = None, seed: Optional[int] = None,
+                       resolution: Optional[Tuple[int, int]] = None,
+                       **kwargs) -> np.ndarray:
+        """
+        Generate a synthetic clip
+
+        Args:
+            prompt: Text prompt; selects the palette and, without a seed, the pattern
+            aspect_ratio: Aspect ratio key into supported_aspect_ratios
+            num_frames: Exact number of frames (takes precedence over duration)
+            fps: Frames per second; motion speed is defined per second
+            duration: Clip duration in seconds
+            seed: Random seed for reproducible results
+            resolution: Optional (width, height) overriding the aspect ratio size
+
+        Returns:
+            np.ndarray: RGB frames with shape (num_frames, height, width, 3)
+        """
+        width, height = resolution or self.supported_aspect_ratios[aspect_ratio]
+        frame_count = self.resolve_num_frames(num_frames, fps, duration)
+        rng = np.random.default_rng(prompt_seed(prompt, seed))
+
+        base, amplitude = self._palette(prompt, rng)
+
+        # Per-channel spatial frequencies (cycles per frame), speeds (cycles per second) and phases
+        freq_x = rng.uniform(0.5, 2.5, 3).astype(np.float32)
+        freq_y = rng.uniform(0.5, 2.5, 3).astype(np.float32)
+        speed_x = rng.uniform(-0.4, 0.4, 3).astype(np.float32)
+        speed_y = rng.uniform(-0.4, 0.4, 3).astype(np.float32)
+        phase_x = rng.uniform(0, 2 * np.pi, 3).astype(np.float32)
+        phase_y = rng.uniform(0, 2 * np.pi, 3).astype(np.float32)
+
+        t = (np.arange(frame_count, dtype=np.float32) / np.float32(fps))[:, None, None]
+        x = (np.arange(width, dtype=np.float32) / np.float32(width))[None, :, None]
+        y = (np.arange(height, dtype=np.float32) / np.float32(height))[None, :, None]
+
+        # Two small (frames, size, 3) wave tables, each contributing half the amplitude
+        two_pi = np.float32(2 * np.pi)
+        wave_x = np.sin(two_pi * (freq_x * x + speed_x * t) + phase_x)
+        wave_y = np.sin(two_pi * (freq_y * y + speed_y * t) + phase_y)
+        half_amplitude = amplitude / 2
+        row = (base / 2 + half_amplitude * (wave_x + 1) / 2).astype(np.uint8)
+        column = (base / 2 + half_amplitude * (wave_y + 1) / 2).astype(np.uint8)
+
+        # Broadcast-add into the preallocated clip; each term is <= 127 so uint8 never overflows
+        frames = np.empty((frame_count, height, width, 3), dtype=np.uint8)
+        np.add(row[:, None, :, :], column[:, :, None, :], out=frames)
+
+        logger.debug(f"Synthetic clip: {frame_count} frames at {width}x{height}")
+        return frames
+
+
+class FFTFilter:
+    """
+    Streaming low-pass FIR filter using FFT overlap-add
+
+    Chunks of any length can be pushed through process(); the convolution tail
+    is carried over so consecutive chunks join without seams.
+    """
+
+    def __init__(self, cutoff_hz: float, sample_rate: int, taps: int = 255):
+        """
+        Initialize FFT filter
+
+        Args:
+            cutoff_hz: Low-pass cutoff frequency
+            sample_rate: Sample rate in Hz
+            taps: FIR length (odd)
+        """
+        n = np.arange(taps, dtype=np.float32) - (taps - 1) / 2
+        kernel = np.sinc(2 * cutoff_hz / sample_rate * n) * np.hamming(taps)
+        self.kernel = (kernel / kernel.sum()).astype(np.float32)
+        self.tail = np.zeros(taps - 1, dtype=np.float32)
+        self._spectra: Dict[int, np.ndarray] = {}
+
+    def _spectrum(self, nfft: int) -> np.ndarray:
+        """Kernel spectrum for an FFT size (cached per size)"""
+        if nfft not in self._spectra:
+            self._spectra[nfft] = np.fft.rfft(self.kernel, nfft)
+        return self._spectra[nfft]
+
+    def process(self, chunk: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Filter one chunk, continuing from the previous chunk's tail"""
+        length = len(chunk)
+        nfft = 1 << int(length + len(self.kernel) - 2).bit_length()
+        filtered = np.fft.irfft(np.fft.rfft(chunk, nfft) * self._spectrum(nfft), nfft)
+        filtered = filtered[:length + len(self.tail)].astype(np.float32, copy=False)
+        filtered[:len(self.tail)] += self.tail
+        self.tail = filtered[length:].copy()
+        if out is None:
+            return filtered[:length]
+        out[:] = filtered[:length]
+        return out
+
+
+class SyntheticAudioEngine:
+    """
+    Synthetic audio generator for development mode
+
+    Works in float32 and renders in fixed-size chunks, so long durations never
+    need more than one chunk of scratch memory. Tones keep phase across chunk
+    boundaries and noise is shaped with a streaming FFT filter. Levels are fixed
+    per voice, so no global normalization pass is needed.
+    """
+
+    def __init__(self, sample_rate: int = 44100, channels: int = 2,
+                 chunk_seconds: float = 1.0):
+        """
+        Initialize synthetic audio engine
+
+        Args:
+            sample_rate: Output sample rate in Hz
+            channels: Number of output channels
+            chunk_seconds: Rendering chunk length in seconds
+        """
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.chunk_size = max(1024, int(chunk_seconds * sample_rate))
+
+    @staticmethod
+    def voice_for_prompt(prompt: str) -> str:
+        """Pick the synthetic voice matching the prompt"""
+        lowered = prompt.lower()
+        for keyword, voice in AUDIO_VOICES:
+            if keyword in lowered:
+                return voice
+        return "ambient"
+
+    def _new_state(self, prompt: str, seed: Optional[int]) -> Dict[str, Any]:
+        """Per-request rendering state"""
+        voice = self.voice_for_prompt(prompt)
+        cutoff = {"nature": 1500.0, "drum": 4000.0, "ambient": 800.0}.get(voice)
+        return {
+            "voice": voice,
+            "rng": np.random.default_rng(prompt_seed(prompt, seed)),
+            "filter": FFTFilter(cutoff, self.sample_rate) if cutoff else None,
+        }
+
+    def _add_tone(self, out: np.ndarray, start: int, freq: float, level: float):
+        """Add a phase-continuous sine starting at sample index start"""
+        step = 2 * np.pi * freq / self.sample_rate
+        phase = np.float32((step * start) % (2 * np.pi))
+        tone = np.arange(len(out), dtype=np.float32)
+        tone *= np.float32(step)
+        tone += phase
+        np.sin(tone, out=tone)
+        tone *= np.float32(level)
+        out += tone
+
+    def _render_into(self, out: np.ndarray, start: int, state: Dict[str, Any]):
+        """Render samples [start, start + len(out)) of a mono signal into out"""
+        voice = state["voice"]
+        out.fill(0)
+
+        if voice == "piano":
+            self._add_tone(out, start, 440.0, 0.6)  # A4 note
+            self._add_tone(out, start, 880.0, 0.2)  # A5 note
+        elif voice == "electronic":
+            self._add_tone(out, start, 200.0, 0.55)
+            self._add_tone(out, start, 300.0, 0.3)
+        else:
+            noise = state["rng"].standard_normal(len(out), dtype=np.float32)
+            state["filter"].process(noise, out=out)
+
+            if voice == "drum":
+                # Decaying hit on every beat at 120 BPM
+                beat = self.sample_rate // 2
+                envelope = ((np.arange(len(out)) + start) % beat).astype(np.float32)
+                envelope *= np.float32(-12.0 / self.sample_rate)
+                np.exp(envelope, out=envelope)
+                out *= envelope
+                out *= np.float32(1.5)
+            elif voice == "nature":
+                out *= np.float32(0.9)
+            else:
+                out *= np.float32(0.6)
+
+            np.clip(out, -1.0, 1.0, out=out)
+
+    def _spread(self, mono: np.ndarray, out: np.ndarray):
+        """Copy a rendered mono row to the remaining channels"""
+        for channel in range(1, out.shape[0]):
+            out[channel] = mono
+
+    def iter_chunks(self, prompt: str, duration: float = 10.0,
+                    seed: Optional[int] = None) -> Iterator[np.ndarray]:
+        """
+        Generate audio chunk by chunk
+
+        Args:
+            prompt: Text prompt; selects the voice and, without a seed, the noise
+            duration: Duration in seconds
+            seed: Random seed for reproducible results
+
+        Yields:
+            np.ndarray: float32 chunks with shape (channels, samples)
+        """
+        total = int(duration * self.sample_rate)
+        state = self._new_state(prompt, seed)
+        for start in range(0, total, self.chunk_size):
+            chunk = np.empty((self.channels, min(self.chunk_size, total - start)), dtype=np.float32)
+            self._render_into(chunk[0], start, state)
+            self._spread(chunk[0], chunk)
+            yield chunk
+
+    def generate_audio(self, prompt: str, duration: float = 10.0,
+                       seed: Optional[int] = None, **kwargs) -> np.ndarray:
+        """
+        Generate a complete synthetic clip
+
+        Args:
+            prompt: Text prompt
+            duration: Duration in seconds
+            seed: Random seed for reproducible results
+
+        Returns:
+            np.ndarray: float32 audio with shape (channels, samples)
+        """
+        total = int(duration * self.sample_rate)
+        state = self._new_state(prompt, seed)
+        audio = np.empty((self.channels, total), dtype=np.float32)
+        for start in range(0, total, self.chunk_size):
+            self._render_into(audio[0, start:start + self.chunk_size], start, state)
+        self._spread(audio[0], audio)
+        return audio
@@ -0,0 +1,70 @@
+"""Tests for backend/admission.py"""
+import pytest
+
+import admission
+from admission import AdmissionController, TokenBucket, estimate_job_cost
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic for buckets and pruning"""
+    now = [1000.0]
+    monkeypatch.setattr(admission.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_token_bucket_wait_time(clock):
+    bucket = TokenBucket(rate=2.0, capacity=10.0)
+    assert bucket.wait_time(10.0) == 0.0
+    bucket.take(10.0)
+    assert bucket.wait_time(4.0) == pytest.approx(2.0)
+    clock[0] += 1.0
+    assert bucket.wait_time(4.0) == pytest.approx(1.0)
+    # Requests larger than the bucket only wait for a full bucket
+    assert bucket.wait_time(50.0) == pytest.approx(4.0)
+    clock[0] += 100.0
+    assert bucket.full()
+
+
+def test_client_limit_retry_after(clock):
+    controller = AdmissionController(workers=1, max_wait=10_000, client_rate=0.5, client_burst=100)
+    assert controller.admit("client", "j1", 100).admitted
+    decision = controller.admit("client", "j2", 10)
+    assert not decision.admitted
+    assert decision.retry_after == pytest.approx(20.0)
+    clock[0] += 20.0
+    assert controller.admit("client", "j2", 10).admitted
+    # Other clients have their own bucket
+    assert controller.admit("other", "j3", 100).admitted
+
+
+def test_backlog_limit_eta_and_release(clock):
+    controller = AdmissionController(workers=2, max_wait=100, client_rate=100, client_burst=1000)
+    first = controller.admit("a", "j1", 150)
+    assert first.admitted and first.eta_seconds == pytest.approx(75.0)
+    decision = controller.admit("b", "j2", 100)
+    assert not decision.admitted
+    assert decision.retry_after == pytest.approx(25.0)
+    controller.release("j1")
+    assert controller.admit("b", "j2", 100).admitted
+
+
+def test_full_idle_buckets_are_pruned(clock):
+    controller = AdmissionController(client_rate=1.0, client_burst=10, prune_interval=60)
+    for index in range(100):
+        controller.admit(f"client-{index}", f"job-{index}", 5)
+        controller.release(f"job-{index}")
+    assert len(controller.buckets) == 100
+    clock[0] += 61.0
+    controller.admit("late", "job-late", 5)
+    assert list(controller.buckets) == ["late"]
+
+
+def test_estimate_scales_with_script_and_profile():
+    script = "A quiet street. A door opens. Someone steps out. " * 10
+    full = estimate_job_cost(script)
+    reduced = estimate_job_cost(script, render_scale=0.5, render_fps=12)
+    progressive = estimate_job_cost(script, progressive=True)
+    assert full["scenes"] == 10
+    assert reduced["cost"] < full["cost"] < progressive["cost"]
+    assert estimate_job_cost(script, extra_outputs=2)["cost"] > full["cost"]
@@ -0,0 +1,45 @@
+"""Tests for the ducking envelope of audio_mixer.AudioMixer"""
+import numpy as np
+import pytest
+
+from audio_mixer import AudioMixer
+
+SAMPLE_RATE = 1000
+BLOCK = 10  # samples per 0.01 s envelope block
+
+
+def block_gain(gain: np.ndarray, index: int) -> float:
+    return float(gain[index * BLOCK + BLOCK // 2])
+
+
+@pytest.fixture
+def ducked():
+    """Gain for a voice active in blocks 100-119 (attack 5 blocks, release 40 blocks)"""
+    mixer = AudioMixer(sample_rate=SAMPLE_RATE, channels=1)
+    voice = np.zeros((1, 300 * BLOCK), dtype=np.float32)
+    voice[:, 100 * BLOCK:120 * BLOCK] = 0.5
+    depth = 10 ** (mixer.settings["duck_depth_db"] / 20)
+    return mixer._duck_gain(voice), depth
+
+
+def test_ducking_starts_at_most_attack_before_voice(ducked):
+    gain, depth = ducked
+    assert block_gain(gain, 90) == pytest.approx(1.0)
+    assert block_gain(gain, 94) == pytest.approx(1.0)
+    assert block_gain(gain, 97) < 1.0
+    assert block_gain(gain, 100) == pytest.approx(depth)
+
+
+def test_ducking_holds_for_release_then_recovers_over_release(ducked):
+    gain, depth = ducked
+    assert block_gain(gain, 119) == pytest.approx(depth)
+    assert block_gain(gain, 159) == pytest.approx(depth)
+    # Recovery ramps over the release time, so it is only partway back after half of it
+    assert depth < block_gain(gain, 180) < 1.0
+    assert block_gain(gain, 201) == pytest.approx(1.0)
+
+
+def test_silent_voice_leaves_beds_untouched():
+    mixer = AudioMixer(sample_rate=SAMPLE_RATE, channels=1)
+    gain = mixer._duck_gain(np.zeros((1, 100 * BLOCK), dtype=np.float32))
+    assert np.allclose(gain, 1.0)
@@ -0,0 +1,217 @@
+"""Tests for backend/generation_scheduler.py"""
+import asyncio
+
+import pytest
+
+from generation_scheduler import GenerationScheduler, FairShare, RenderSlots, QueuedJob
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_scheduler(workers: int = 1, **kwargs):
+    clock = Clock()
+    return GenerationScheduler(None, workers, clock=clock, **kwargs), clock
+
+
+def dispatch(scheduler, count: int):
+    """Pop jobs in order, marking each as running like the workers do"""
+    order = []
+    for _ in range(count):
+        job = scheduler.pop()
+        if job is None:
+            break
+        scheduler.running[job.job_id] = job
+        order.append(job.job_id)
+    return order
+
+
+def test_interactive_before_batch_then_cheapest_first():
+    scheduler, _ = make_scheduler(workers=4, batch_slots=4, tenant_workers=4)
+    scheduler.push(QueuedJob("batch-small", {}, "batch", 10))
+    scheduler.push(QueuedJob("big", {}, "interactive", 500))
+    scheduler.push(QueuedJob("small", {}, "interactive", 50))
+    scheduler.push(QueuedJob("batch-big", {}, "batch", 900))
+    assert dispatch(scheduler, 4) == ["small", "big", "batch-small", "batch-big"]
+
+
+def test_aging_lets_a_waiting_job_overtake_smaller_newer_ones():
+    scheduler, clock = make_scheduler(aging_rate=1.0)
+    scheduler.push(QueuedJob("old", {}, "interactive", 300))
+    clock.now = 250.0
+    scheduler.push(QueuedJob("new", {}, "interactive", 100))
+    # old: 300 - 250 = 50 aged cost, new: 100
+    assert scheduler.pop().job_id == "old"
+
+
+def test_batch_job_is_promoted_after_waiting():
+    scheduler, clock = make_scheduler(aging_rate=0.0, promote_after=600.0)
+    scheduler.push(QueuedJob("batch", {}, "batch", 100))
+    clock.now = 600.0
+    scheduler.push(QueuedJob("interactive", {}, "interactive", 500))
+    assert scheduler.pop().job_id == "batch"
+    assert scheduler.stats["promoted"] == 1
+
+
+def test_batch_slots_keep_a_worker_free_for_interactive_work():
+    scheduler, clock = make_scheduler(workers=2, promote_after=600.0, tenant_workers=2)
+    scheduler.push(QueuedJob("b1", {}, "batch", 100))
+    scheduler.push(QueuedJob("b2", {}, "batch", 100))
+    assert dispatch(scheduler, 2) == ["b1"]
+    scheduler.push(QueuedJob("i1", {}, "interactive", 100))
+    assert dispatch(scheduler, 1) == ["i1"]
+    # Once promoted, the waiting batch job may use the reserved worker
+    del scheduler.running["i1"]
+    clock.now = 600.0
+    assert dispatch(scheduler, 1) == ["b2"]
+
+
+def test_tenants_share_dispatch_by_weight():
+    scheduler, _ = make_scheduler(tenant_workers=100, fair_share=FairShare({"b": 3}))
+    for index in range(20):
+        scheduler.push(QueuedJob(f"a{index}", {}, "batch", 100, "a"))
+    for index in range(20):
+        scheduler.push(QueuedJob(f"b{index}", {}, "batch", 100, "b"))
+    order = [scheduler.pop().tenant for _ in range(16)]
+    assert order.count("b") == 12
+    assert order.count("a") == 4
+
+
+def test_idle_tenant_does_not_bank_credit():
+    scheduler, _ = make_scheduler(tenant_workers=100)
+    for index in range(10):
+        scheduler.push(QueuedJob(f"a{index}", {}, "batch", 100, "a"))
+    for _ in range(5):
+        scheduler.pop()
+    # b arrives after a was served 500; it starts level with a, not 500 ahead
+    for index in range(10):
+        scheduler.push(QueuedJob(f"b{index}", {}, "batch", 100, "b"))
+    order = [scheduler.pop().tenant for _ in range(6)]
+    assert order.count("a") == 3
+    assert order.count("b") == 3
+
+
+def test_one_tenant_cannot_hold_every_worker():
+    scheduler, _ = make_scheduler(workers=3, batch_slots=3)
+    for index in range(10):
+        scheduler.push(QueuedJob(f"a{index}", {}, "batch", 100, "a"))
+    assert len(dispatch(scheduler, 3)) == 2
+    scheduler.push(QueuedJob("b0", {}, "batch", 100, "b"))
+    assert dispatch(scheduler, 1) == ["b0"]
+
+
+def test_second_tenant_gets_a_render_slot_while_first_holds_every_slot():
+    async def scenario():
+        slots = RenderSlots(2, FairShare())
+        order = []
+        release = {}
+
+        async def render(name, tenant):
+            async with slots.slot(tenant):
+                order.append(name)
+                release[name] = asyncio.Event()
+                await release[name].wait()
+
+        tasks = [asyncio.create_task(render(f"a{index}", "a")) for index in range(4)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(render("b0", "b")))
+        await asyncio.sleep(0)
+        assert order == ["a0", "a1"]
+
+        release["a0"].set()
+        await asyncio.sleep(0.01)
+        assert order == ["a0", "a1", "b0"]
+
+        for name in ("a1", "b0", "a2", "a3"):
+            release[name].set()
+            await asyncio.sleep(0.01)
+        await asyncio.wait_for(asyncio.gather(*tasks), 1)
+        assert slots.in_use == 0
+
+    asyncio.run(scenario())
+
+
+def test_interactive_render_waiters_go_first():
+    async def scenario():
+        slots = RenderSlots(1, FairShare())
+        order = []
+        gate = asyncio.Event()
+
+        async def render(name, tenant, priority):
+            async with slots.slot(tenant, priority=priority):
+                order.append(name)
+                if name == "first":
+                    await gate.wait()
+
+        tasks = [asyncio.create_task(render("first", "a", "batch"))]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(render("batch", "b", "batch")))
+        tasks.append(asyncio.create_task(render("interactive", "a", "interactive")))
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.wait_for(asyncio.gather(*tasks), 1)
+        assert order == ["first", "interactive", "batch"]
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_does_not_strand_the_slot():
+    async def scenario():
+        slots = RenderSlots(1, FairShare())
+        entered = []
+
+        async def render(name):
+            async with slots.slot("a"):
+                entered.append(name)
+                await asyncio.sleep(10 if name == "a" else 0)
+
+        holder = asyncio.create_task(render("a"))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(render("b"))
+        last = asyncio.create_task(render("c"))
+        await asyncio.sleep(0)
+
+        # The waiter is cancelled before the holder releases, in the same loop step
+        holder.cancel()
+        waiter.cancel()
+        await asyncio.wait_for(last, 1)
+        assert entered == ["a", "c"]
+        assert slots.in_use == 0
+
+    asyncio.run(scenario())
+
+
+def test_worker_pool_runs_jobs_and_survives_failures():
+    async def scenario():
+        order = []
+
+        async def run(job_id, payload):
+            order.append(job_id)
+            if job_id == "bad":
+                raise RuntimeError("boom")
+
+        scheduler = GenerationScheduler(run, workers=1)
+        await scheduler.submit("big", {}, cost=1000)
+        await scheduler.submit("bad", {}, cost=5)
+        await scheduler.submit("small", {}, cost=10)
+        await scheduler.start()
+        await asyncio.sleep(0.05)
+        await scheduler.close()
+        return order, scheduler.stats
+
+    order, stats = asyncio.run(scenario())
+    assert order == ["bad", "small", "big"]
+    assert stats["failed"] == 1
+    assert stats["dispatched"] == 3
+
+
+@pytest.mark.parametrize("priority", ["urgent", ""])
+def test_unknown_priority_is_rejected(priority):
+    scheduler, _ = make_scheduler()
+    with pytest.raises(ValueError):
+        scheduler.push(QueuedJob("job", {}, priority, 1))
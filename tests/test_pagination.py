@@ -0,0 +1,83 @@
+"""Tests for backend/pagination.py"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from pagination import InvalidCursor, encode_cursor, decode_cursor, keyset_page
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, keys):
+        for field, direction in reversed(keys):
+            self.documents.sort(key=lambda document: document[field], reverse=direction < 0)
+        return self
+
+    def limit(self, count):
+        self.documents = self.documents[:count]
+        return self
+
+    async def to_list(self, length):
+        return self.documents[:length]
+
+
+class FakeCollection:
+    """Just enough of find() for keyset queries: equality, $lt and $or"""
+
+    def __init__(self, documents):
+        self.documents = documents
+
+    @classmethod
+    def matches(cls, document, query):
+        for field, condition in query.items():
+            if field == "$or":
+                if not any(cls.matches(document, option) for option in condition):
+                    return False
+            elif isinstance(condition, dict):
+                if not document[field] < condition["$lt"]:
+                    return False
+            elif document[field] != condition:
+                return False
+        return True
+
+    def find(self, query, projection):
+        return FakeCursor([dict(document) for document in self.documents if self.matches(document, query)])
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123000)
+    assert decode_cursor(encode_cursor(created_at, "abc")) == (created_at, "abc")
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "", encode_cursor(datetime(2024, 1, 1), "x")[:-4]])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
+
+
+def test_pages_cover_every_item_once_with_ties_and_inserts():
+    base = datetime(2024, 1, 1)
+    # Pairs of items share a created_at, so the id breaks ties
+    documents = [
+        {"item_id": f"id-{index:02d}", "created_at": base + timedelta(seconds=index // 2)}
+        for index in range(25)
+    ]
+    collection = FakeCollection(documents)
+
+    async def walk():
+        seen, cursor = [], None
+        while True:
+            page = await keyset_page(collection, {}, "item_id", {}, 10, cursor)
+            seen += [item["item_id"] for item in page["items"]]
+            if len(seen) == 10:
+                # A newer item inserted mid-walk does not shift later pages
+                documents.append({"item_id": "id-99", "created_at": base + timedelta(days=1)})
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return seen
+
+    seen = asyncio.run(walk())
+    assert seen == [f"id-{index:02d}" for index in reversed(range(25))]
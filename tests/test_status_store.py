@@ -0,0 +1,51 @@
+"""Tests for backend/status_store.py"""
+import asyncio
+
+import pytest
+
+import status_store
+from status_store import LocalStatusStore
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(status_store.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(status_store.time, "time", lambda: now[0])
+    return now
+
+
+def test_touch_is_throttled_and_ignores_unknown_ids(clock):
+    async def scenario():
+        store = LocalStatusStore(touch_interval=10.0)
+        await store.touch("missing")
+        assert await store.last_viewed("missing") == 0.0
+
+        await store.set("g", {"status": "processing"})
+        await store.touch("g")
+        assert await store.last_viewed("g") == 1000.0
+        clock[0] += 5.0
+        await store.touch("g")
+        assert await store.last_viewed("g") == 1000.0
+        clock[0] += 5.0
+        await store.touch("g")
+        assert await store.last_viewed("g") == 1010.0
+
+    asyncio.run(scenario())
+
+
+def test_finished_and_idle_generations_are_evicted(clock):
+    async def scenario():
+        store = LocalStatusStore(ttl_seconds=3600, terminal_ttl=300)
+        await store.set("done", {"status": "completed"})
+        await store.set("running", {"status": "processing"})
+        clock[0] += 301.0
+        await store.set("new", {"status": "queued"})
+        assert await store.get("done") is None
+        assert await store.get("running") is not None
+        clock[0] += 3600.0
+        await store.update("new", {"progress": 50.0})
+        assert await store.get("running") is None
+        assert (await store.get("new"))["version"] == 2
+
+    asyncio.run(scenario())
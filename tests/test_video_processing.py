@@ -0,0 +1,44 @@
+"""Tests for chunked and reduced-resolution rendering helpers in video_processing.py"""
+import numpy as np
+import pytest
+
+from video_processing import plan_temporal_chunks, scaled_resolution, upscale_frames
+
+
+@pytest.mark.parametrize("total_frames", [1, 40, 81, 82, 104, 160, 300, 1000])
+def test_chunks_cover_the_clip_with_little_waste(total_frames):
+    plan = plan_temporal_chunks(total_frames, max_frames=81, overlap=8)
+    lengths = {length for _, length in plan}
+    assert len(lengths) == 1
+    length = lengths.pop()
+    assert length <= 81 and (length - 1) % 4 == 0
+    assert plan[0][0] == 0
+    for (start, _), (next_start, _) in zip(plan, plan[1:]):
+        assert next_start - start == length - 8
+    overrun = plan[-1][0] + length - total_frames
+    assert 0 <= overrun <= 3 * len(plan)
+
+
+def test_clip_just_over_the_limit_renders_two_short_chunks():
+    assert plan_temporal_chunks(82) == [(0, 45), (37, 45)]
+
+
+@pytest.mark.parametrize("width,height", [(832, 480), (480, 832), (1280, 720), (512, 512)])
+@pytest.mark.parametrize("scale", [0.25, 0.5, 0.75])
+def test_scaled_resolution_keeps_aspect_ratio(width, height, scale):
+    scaled_width, scaled_height = scaled_resolution(width, height, scale)
+    assert scaled_width % 16 == 0 and scaled_height % 16 == 0
+    assert abs(scaled_width - width * scale) <= 16
+    assert abs(scaled_height - height * scale) <= 16
+    assert scaled_width / scaled_height == pytest.approx(width / height, rel=0.02)
+
+
+def test_upscale_crops_instead_of_stretching():
+    # A centered square stays square after upscaling a slightly wider render
+    frames = np.zeros((1, 128, 224, 3), dtype=np.uint8)
+    frames[:, 32:96, 80:144] = 255
+    output = upscale_frames(frames, (832, 480))
+    assert output.shape == (1, 480, 832, 3)
+    rows = np.flatnonzero(output[0, :, :, 0].max(axis=1) > 127)
+    columns = np.flatnonzero(output[0, :, :, 0].max(axis=0) > 127)
+    assert len(columns) == pytest.approx(len(rows), abs=2)
@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Video Processing Utilities for Script-to-Video
+Frame-array operations shared by the WAN 2.1 generator and the backend pipeline
+"""
+import os
+import logging
+import tempfile
+import numpy as np
+import cv2
+from typing import Any, Optional, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def valid_frame_count(num_frames: int, max_frames: int = 81) -> int:
+    """
+    Round a frame count up to WAN's valid 4n+1 lengths
+
+    Args:
+        num_frames: Requested number of frames
+        max_frames: Model limit (itself 4n+1)
+
+    Returns:
+        int: Smallest 4n+1 >= num_frames, capped at max_frames
+    """
+    return min(max_frames, ((max(1, num_frames) + 2) // 4) * 4 + 1)
+
+
+def plan_temporal_chunks(total_frames: int, max_frames: int = 81,
+                         overlap: int = 8) -> List[Tuple[int, int]]:
+    """
+    Split a clip into overlapping chunks of valid length
+
+    All chunks share one length so they can be rendered as a single batch.
+    The chunk count is the fewest max_frames chunks that cover the clip, and
+    the length is then balanced down to the shortest valid length that still
+    covers it, so at most a few frames per chunk run past total_frames (they
+    are trimmed when blending).
+
+    Args:
+        total_frames: Frames needed in the final clip
+        max_frames: Longest chunk the model can render
+        overlap: Frames shared by consecutive chunks
+
+    Returns:
+        List of (start_frame, num_frames) tuples
+    """
+    if total_frames <= max_frames:
+        return [(0, valid_frame_count(total_frames, max_frames))]
+    count = int(np.ceil((total_frames - overlap) / (max_frames - overlap)))
+    length = valid_frame_count(int(np.ceil((total_frames + (count - 1) * overlap) / count)), max_frames)
+    return [(index * (length - overlap), length) for index in range(count)]
+
+
+def blend_chunks(chunks: List[np.ndarray], plan: List[Tuple[int, int]],
+                 total_frames: int) -> np.ndarray:
+    """
+    Join overlapping chunks into one clip with linear crossfades at the seams
+
+    Args:
+        chunks: uint8 frame arrays shaped (frames, height, width, 3)
+        plan: (start_frame, num_frames) per chunk, as from plan_temporal_chunks
+        total_frames: Frames in the output clip
+
+    Returns:
+        np.ndarray: uint8 clip shaped (total_frames, height, width, 3)
+    """
+    if len(chunks) == 1:
+        return chunks[0][:total_frames]
+
+    output = np.empty((total_frames,) + chunks[0].shape[1:], dtype=np.uint8)
+    previous_end = 0
+    for chunk, (start, _) in zip(chunks, plan):
+        end = min(start + len(chunk), total_frames)
+        seam = max(0, previous_end - start)
+        if seam:
+            # Crossfade weights run from the previous chunk towards this one
+            weights = (np.arange(1, seam + 1, dtype=np.float32) / (seam + 1))[:, None, None, None]
+            blended = output[start:start + seam] * (1 - weights) + chunk[:seam] * weights
+            np.copyto(output[start:start + seam], blended, casting="unsafe")
+        output[start + seam:end] = chunk[seam:end - start]
+        previous_end = end
+
+    return output
+
+
+def rendered_frame_count(num_frames: int, fps: int, render_fps: int) -> int:
+    """Frames to render at render_fps so interpolation can cover num_frames at fps"""
+    return int(np.ceil((num_frames - 1) * render_fps / fps)) + 1
+
+
+def estimate_flow(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """Dense Farneback optical flow from first to second (RGB uint8 frames)"""
+    return cv2.calcOpticalFlowFarneback(
+        cv2.cvtColor(first, cv2.COLOR_RGB2GRAY),
+        cv2.cvtColor(second, cv2.COLOR_RGB2GRAY),
+        None, 0.5, 3, 15, 3, 5, 1.2, 0
+    )
+
+
+def interpolate_frames(frames: np.ndarray, source_fps: float, target_fps: float,
+                       num_frames: Optional[int] = None) -> np.ndarray:
+    """
+    Raise a clip's frame rate with optical-flow warping
+
+    Each output frame at time t falls between source frames k and k + 1 at
+    fraction a. Both neighbours are warped along the flow from k to k + 1
+    (k backwards by a, k + 1 forwards by 1 - a) and blended. Flow is computed
+    once per source pair and the remap grids are built with numpy.
+
+    Args:
+        frames: uint8 RGB frames shaped (frames, height, width, 3) at source_fps
+        source_fps: Frame rate of the input
+        target_fps: Frame rate of the output
+        num_frames: Output frame count (default: same duration at target_fps)
+
+    Returns:
+        np.ndarray: uint8 frames shaped (num_frames, height, width, 3)
+    """
+    if num_frames is None:
+        num_frames = int(round(len(frames) * target_fps / source_fps))
+
+    height, width = frames.shape[1:3]
+    grid_x = np.arange(width, dtype=np.float32)[None, :]
+    grid_y = np.arange(height, dtype=np.float32)[:, None]
+
+    output = np.empty((num_frames, height, width, 3), dtype=np.uint8)
+    positions = np.arange(num_frames, dtype=np.float64) * (source_fps / target_fps)
+    flow_index, flow = -1, None
+
+    for index, position in enumerate(positions):
+        source = min(int(position), len(frames) - 1)
+        alpha = float(position - source)
+        if alpha < 1e-3 or source == len(frames) - 1:
+            output[index] = frames[source]
+            continue
+
+        if flow_index != source:
+            flow_index, flow = source, estimate_flow(frames[source], frames[source + 1])
+
+        flow_x, flow_y = flow[..., 0], flow[..., 1]
+        previous = cv2.remap(frames[source], grid_x - alpha * flow_x, grid_y - alpha * flow_y,
+                             cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+        following = cv2.remap(frames[source + 1], grid_x + (1 - alpha) * flow_x,
+                              grid_y + (1 - alpha) * flow_y,
+                              cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+        cv2.addWeighted(previous, 1 - alpha, following, alpha, 0, dst=output[index])
+
+    return output
+
+
+def scaled_resolution(width: int, height: int, scale: float, multiple: int = 16) -> Tuple[int, int]:
+    """
+    Scale a resolution to sides that are multiples the model accepts
+
+    Rounding each side on its own distorts the aspect ratio at small scales,
+    so sizes within one multiple of the exact scaled size are compared and the
+    one closest to the original aspect ratio wins (then the closest in area).
+    """
+    aspect = width / height
+    target_width, target_height = width * scale, height * scale
+
+    def near(side):
+        base = int(side // multiple) * multiple
+        return {max(multiple, base + step * multiple) for step in (-1, 0, 1, 2)}
+
+    candidates = [
+        (candidate_width, candidate_height)
+        for candidate_width in near(target_width) if abs(candidate_width - target_width) <= multiple
+        for candidate_height in near(target_height) if abs(candidate_height - target_height) <= multiple
+    ]
+    return min(candidates, key=lambda size: (
+        round(abs(size[0] / size[1] - aspect) / aspect, 4),
+        abs(size[0] * size[1] - target_width * target_height)
+    ))
+
+
+def upscale_frames(frames: np.ndarray, size: Tuple[int, int],
+                   interpolation: int = cv2.INTER_LANCZOS4) -> np.ndarray:
+    """
+    Resize a whole clip into one preallocated array
+
+    When the clip's aspect ratio differs slightly from the target's (render
+    sizes are rounded to model multiples), the excess is center-cropped first
+    so the picture is never stretched.
+
+    Args:
+        frames: uint8 frames shaped (frames, height, width, channels)
+        size: Target (width, height)
+        interpolation: OpenCV interpolation flag (default: Lanczos)
+
+    Returns:
+        np.ndarray: uint8 frames shaped (frames, size[1], size[0], channels)
+    """
+    width, height = size
+    if frames.shape[1:3] == (height, width):
+        return frames
+
+    source_height, source_width = frames.shape[1:3]
+    if source_width * height > width * source_height:
+        crop = int(round(source_height * width / height))
+        left = (source_width - crop) // 2
+        frames = frames[:, :, left:left + crop]
+    elif source_width * height < width * source_height:
+        crop = int(round(source_width * height / width))
+        top = (source_height - crop) // 2
+        frames = frames[:, top:top + crop]
+
+    output = np.empty((len(frames), height, width) + frames.shape[3:], dtype=frames.dtype)
+    for frame, target in zip(frames, output):
+        cv2.resize(frame, (width, height), dst=target, interpolation=interpolation)
+    return output
+
+
+def parse_aspect_ratio(aspect_ratio: str) -> float:
+    """Width / height of an 'W:H' aspect ratio string"""
+    width, height = aspect_ratio.split(":")
+    return float(width) / float(height)
+
+
+def saliency_center(frames: np.ndarray, sample_frames: int = 8, analysis_width: int = 96) -> Tuple[float, float]:
+    """
+    Estimate where the action is in a clip
+
+    Combines spatial gradient energy with frame-to-frame change on a few
+    downscaled frames and returns the energy centroid.
+
+    Args:
+        frames: uint8 RGB frames shaped (frames, height, width, 3)
+        sample_frames: Frames sampled across the clip
+        analysis_width: Width the samples are downscaled to
+
+    Returns:
+        (x, y) centroid as fractions of width and height
+    """
+    height, width = frames.shape[1:3]
+    size = (analysis_width, max(1, int(round(analysis_width * height / width))))
+    indices = np.linspace(0, len(frames) - 1, min(sample_frames, len(frames))).astype(int)
+    gray = np.stack([
+        cv2.resize(cv2.cvtColor(frames[index], cv2.COLOR_RGB2GRAY), size, interpolation=cv2.INTER_AREA)
+        for index in indices
+    ]).astype(np.float32)
+
+    energy = np.zeros(gray.shape[1:], dtype=np.float32)
+    energy[:, 1:] += np.abs(np.diff(gray, axis=2)).mean(axis=0)
+    energy[1:, :] += np.abs(np.diff(gray, axis=1)).mean(axis=0)
+    if len(gray) > 1:
+        energy += 2 * np.abs(np.diff(gray, axis=0)).mean(axis=0)
+
+    total = float(energy.sum())
+    if total <= 0:
+        return 0.5, 0.5
+    center_x = float((energy.sum(axis=0) * (np.arange(size[0]) + 0.5)).sum()) / total / size[0]
+    center_y = float((energy.sum(axis=1) * (np.arange(size[1]) + 0.5)).sum()) / total / size[1]
+    return center_x, center_y
+
+
+def _even(value: float) -> int:
+    """Round to an even pixel count (required by H.264 4:2:0)"""
+    return max(2, int(round(value / 2)) * 2)
+
+
+def reframe_frames(frames: np.ndarray, aspect_ratio: str, mode: str = "auto",
+                   min_crop_coverage: float = 0.5) -> np.ndarray:
+    """
+    Derive a clip in another aspect ratio from rendered frames
+
+    'crop' keeps a window of the target ratio centered on the clip's saliency
+    centroid (one static window per clip, so framing never jitters). 'pad'
+    fits the whole frame inside the target ratio over a blurred, cover-scaled
+    copy of itself. 'auto' crops when at least min_crop_coverage of the frame
+    survives and pads otherwise.
+
+    Args:
+        frames: uint8 RGB frames shaped (frames, height, width, 3)
+        aspect_ratio: Target aspect ratio such as '9:16', '1:1' or '4:5'
+        mode: 'crop', 'pad' or 'auto'
+        min_crop_coverage: Smallest kept fraction for 'auto' to choose cropping
+
+    Returns:
+        np.ndarray: uint8 frames in the target aspect ratio
+    """
+    height, width = frames.shape[1:3]
+    source_ratio = width / height
+    target_ratio = parse_aspect_ratio(aspect_ratio)
+
+    # Fraction of the frame a crop keeps
+    coverage = min(source_ratio, target_ratio) / max(source_ratio, target_ratio)
+    if mode == "auto":
+        mode = "crop" if coverage >= min_crop_coverage else "pad"
+
+    if mode == "crop":
+        crop_width = min(width, _even(height * target_ratio))
+        crop_height = min(height, _even(width / target_ratio))
+        center_x, center_y = saliency_center(frames)
+        left = int(np.clip(center_x * width - crop_width / 2, 0, width - crop_width))
+        top = int(np.clip(center_y * height - crop_height / 2, 0, height - crop_height))
+        return np.ascontiguousarray(frames[:, top:top + crop_height, left:left + crop_width])
+
+    # Pad: the full frame sits inside a canvas of the target ratio
+    if target_ratio < source_ratio:
+        canvas_width, canvas_height = _even(width), _even(width / target_ratio)
+    else:
+        canvas_width, canvas_height = _even(height * target_ratio), _even(height)
+    scale = min(canvas_width / width, canvas_height / height)
+    fit_width, fit_height = _even(width * scale), _even(height * scale)
+    left, top = (canvas_width - fit_width) // 2, (canvas_height - fit_height) // 2
+
+    # Background: cover-scaled, blurred at low resolution for speed
+    cover = max(canvas_width / width, canvas_height / height)
+    small = (max(1, canvas_width // 8), max(1, canvas_height // 8))
+    crop_w, crop_h = int(canvas_width / cover), int(canvas_height / cover)
+    x0, y0 = (width - crop_w) // 2, (height - crop_h) // 2
+
+    output = np.empty((len(frames), canvas_height, canvas_width, 3), dtype=np.uint8)
+    for frame, target in zip(frames, output):
+        background = cv2.resize(frame[y0:y0 + crop_h, x0:x0 + crop_w], small, interpolation=cv2.INTER_AREA)
+        background = cv2.GaussianBlur(background, (0, 0), 3)
+        cv2.resize(background, (canvas_width, canvas_height), dst=target, interpolation=cv2.INTER_LINEAR)
+        target[top:top + fit_height, left:left + fit_width] = (
+            frame if (fit_width, fit_height) == (width, height)
+            else cv2.resize(frame, (fit_width, fit_height), interpolation=cv2.INTER_AREA)
+        )
+    return output
+
+
+def decode_clip_frames(path: str) -> Optional[np.ndarray]:
+    """Decode an encoded clip back into a uint8 RGB frame array"""
+    capture = cv2.VideoCapture(path)
+    frames = []
+    try:
+        while True:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    finally:
+        capture.release()
+    return np.stack(frames) if frames else None
+
+
+def select_poster_frame(frames: np.ndarray, candidates: int = 8, analysis_width: int = 160) -> np.ndarray:
+    """
+    Pick the sharpest of a few frames sampled from the middle of a clip
+
+    Args:
+        frames: uint8 RGB frames shaped (frames, height, width, 3)
+        candidates: Frames sampled between 10% and 90% of the clip
+        analysis_width: Width candidates are downscaled to before scoring
+
+    Returns:
+        np.ndarray: The chosen uint8 RGB frame (a view into frames)
+    """
+    height, width = frames.shape[1:3]
+    size = (analysis_width, max(1, int(round(analysis_width * height / width))))
+    first, last = int(len(frames) * 0.1), max(int(len(frames) * 0.9) - 1, 0)
+    indices = np.unique(np.linspace(first, last, candidates).astype(int))
+
+    # Variance of the Laplacian: higher means more detail and less motion blur
+    scores = [
+        cv2.Laplacian(cv2.resize(cv2.cvtColor(frames[index], cv2.COLOR_RGB2GRAY), size,
+                                 interpolation=cv2.INTER_AREA), cv2.CV_32F).var()
+        for index in indices
+    ]
+    return frames[indices[int(np.argmax(scores))]]
+
+
+def thumbnail_strip(images: List[np.ndarray], height: int = 90) -> np.ndarray:
+    """Resize images to a common height and join them left to right"""
+    tiles = [
+        cv2.resize(image, (max(1, int(round(image.shape[1] * height / image.shape[0]))), height),
+                   interpolation=cv2.INTER_AREA)
+        for image in images
+    ]
+    return np.concatenate(tiles, axis=1)
+
+
+def fit_image(image: np.ndarray, max_width: int) -> np.ndarray:
+    """Downscale an image to at most max_width pixels wide"""
+    height, width = image.shape[:2]
+    if width <= max_width:
+        return image
+    return cv2.resize(image, (max_width, int(round(height * max_width / width))), interpolation=cv2.INTER_AREA)
+
+
+# Image format -> (OpenCV extension, quality flag, MIME type)
+IMAGE_FORMATS = {
+    "webp": (".webp", cv2.IMWRITE_WEBP_QUALITY, "image/webp"),
+    "jpeg": (".jpg", cv2.IMWRITE_JPEG_QUALITY, "image/jpeg"),
+}
+
+
+def encode_image(image: np.ndarray, image_format: str = "webp", quality: int = 80) -> Optional[bytes]:
+    """Encode an RGB image in memory; None if encoding failed"""
+    extension, quality_flag, _ = IMAGE_FORMATS[image_format]
+    ok, buffer = cv2.imencode(extension, cv2.cvtColor(image, cv2.COLOR_RGB2BGR), [quality_flag, quality])
+    return buffer.tobytes() if ok else None
+
+
+def decode_image(data: bytes) -> Optional[np.ndarray]:
+    """Decode encoded image bytes to an RGB array; None if decoding failed"""
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB) if image is not None else None
+
+
+def to_uint8_frames(frames: Any) -> np.ndarray:
+    """Convert pipeline output (PIL images or float arrays in [0, 1]) to a uint8 frame array"""
+    if isinstance(frames, list):
+        frames = np.stack([np.asarray(frame) for frame in frames])
+    frames = np.asarray(frames)
+    if frames.dtype != np.uint8:
+        frames = (np.clip(frames, 0.0, 1.0) * 255 + 0.5).astype(np.uint8)
+    return frames
+
+
+def encode_frames(frames: np.ndarray, fps: int) -> bytes:
+    """
+    Encode RGB frames to MP4 bytes
+
+    Args:
+        frames: uint8 RGB frames shaped (frames, height, width, 3)
+        fps: Frames per second
+
+    Returns:
+        bytes: MP4 video data
+    """
+    height, width = frames.shape[1:3]
+
+    # Create temporary video file
+    with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as tmp_file:
+        tmp_path = tmp_file.name
+
+    try:
+        # Use OpenCV to create video
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        out = cv2.VideoWriter(tmp_path, fourcc, fps, (width, height))
+        for frame in frames:
+            # Convert RGB to BGR for OpenCV
+            out.write(cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
+        out.release()
+
+        with open(tmp_path, 'rb') as f:
+            return f.read()
+    finally:
+        os.unlink(tmp_path)